@@ -8,6 +8,8 @@ import argparse
 import asyncio
 import json
 
+from my_twitter_api_v3.follows.follow_system import TwitterFollower
+
 
 class BulkFollowWorkflow:
     """Workflow for managing bulk following operations"""
@@ -56,40 +58,35 @@ class BulkFollowWorkflow:
     async def smart_follow(self, max_accounts: int = 10):
         """
         Smart following strategy:
-        1. Follow high priority accounts first
+        1. Give the budget to pending high priority accounts first
         2. Then medium priority
         3. Finally low priority
+        The tiers then run concurrently within the follower's rate limits.
         """
         print("Starting smart follow strategy...")
 
         total_results = {"followed": 0, "failed": 0, "skipped": 0, "details": []}
 
+        # Split the budget across tiers up front, in priority order, so the
+        # tiers can run concurrently instead of waiting on each other
+        quotas = []
         remaining_accounts = max_accounts
-
-        # Follow high priority first
-        if remaining_accounts > 0:
-            print("\n--- Following HIGH priority accounts ---")
-            results = await self.follow_by_priority("high", remaining_accounts)
-            total_results["followed"] += results["followed"]
-            total_results["failed"] += results["failed"]
-            total_results["skipped"] += results["skipped"]
-            total_results["details"].extend(results["details"])
-            remaining_accounts -= results["followed"]
-
-        # Follow medium priority next
-        if remaining_accounts > 0:
-            print("\n--- Following MEDIUM priority accounts ---")
-            results = await self.follow_by_priority("medium", remaining_accounts)
-            total_results["followed"] += results["followed"]
-            total_results["failed"] += results["failed"]
-            total_results["skipped"] += results["skipped"]
-            total_results["details"].extend(results["details"])
-            remaining_accounts -= results["followed"]
-
-        # Follow low priority last
-        if remaining_accounts > 0:
-            print("\n--- Following LOW priority accounts ---")
-            results = await self.follow_by_priority("low", remaining_accounts)
+        for priority in ("high", "medium", "low"):
+            quota = min(
+                remaining_accounts,
+                len(self.follower.get_pending_accounts(filter_by_priority=priority)),
+            )
+            if quota > 0:
+                quotas.append((priority, quota))
+                remaining_accounts -= quota
+
+        for priority, quota in quotas:
+            print(f"\n--- Following {priority.upper()} priority accounts (up to {quota}) ---")
+
+        tier_results = await asyncio.gather(
+            *(self.follow_by_priority(priority, quota) for priority, quota in quotas)
+        )
+        for results in tier_results:
             total_results["followed"] += results["followed"]
             total_results["failed"] += results["failed"]
             total_results["skipped"] += results["skipped"]
@@ -165,6 +162,8 @@ async def main():
         print("\nOperation cancelled by user")
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        await workflow.follower.close()
 
 
 if __name__ == "__main__":
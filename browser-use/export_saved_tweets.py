@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""
+Export data/001_saved_tweets.jsonl as a single JSON array
+
+The saved tweets file is append-only; run this when a tool needs the merged
+array form with one entry per tweet. The output is a separate file: the legacy
+data/001_saved_tweets.json is what tweet_store migrates from, so it is never
+written here. Compacting the log in place is tweet_store.compact_saved_tweets,
+which get_data.py runs after each fetch.
+"""
+import argparse
+import os
+
+from my_twitter_api_v3.utils.tweet_store import SAVED_TWEETS_FILE, export_saved_tweets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export saved tweets as a JSON array")
+    parser.add_argument(
+        "--output",
+        default=os.path.splitext(SAVED_TWEETS_FILE)[0] + ".export.json",
+        help="Destination JSON file (default: data/001_saved_tweets.export.json)",
+    )
+    args = parser.parse_args()
+
+    count = export_saved_tweets(args.output)
+    print(f"Exported {count} saved tweets to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
-import requests
+import aiohttp
+import asyncio
 import json
-import time
-import threading
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 import os
-from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from my_twitter_api_v3.utils.json_io import aiter_json_records, dumps, loads, read_json
+from my_twitter_api_v3.utils.tweet_store import compact_saved_tweets, iter_saved_tweets, save_tweets
+from my_twitter_api_v3.utils.near_dup import SimHashIndex
 
 # Get current time and subtract one hour
 current_time = datetime.now()
@@ -14,15 +19,25 @@ current_time = datetime.now()
 twelve_hours_ago = current_time - timedelta(hours=12)
 start_date = twelve_hours_ago.strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
-SCRIPT_DIR = os.path.dirname(__file__)
-pathToData = "../data"
-users_file = "/004_users.json"
+SCRIPT_DIR = Path(__file__).resolve().parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+SAVED_TWEETS_FILE = DATA_DIR / "001_saved_tweets.jsonl"
+# Every *_users.json file in the data directory is merged into a single trigger
+USERS_FILE_PATTERN = "*_users.json"
+# Users sent to Bright Data per run, in file order; each one is a paid collection.
+# Set TW_MAX_USERS to 0 to send everyone.
+MAX_USERS = int(os.getenv("TW_MAX_USERS", "3"))
 
 load_dotenv()
 token = os.getenv("TOKEN")
+# Set TW_DEBUG to print request payloads, raw responses and sample parsed items
+DEBUG = bool(os.getenv("TW_DEBUG"))
 url = "https://api.brightdata.com/datasets/v3/trigger"
-headers = {
+# Sent with every request on the shared session
+session_headers = {
 	"Authorization": "Bearer " + token,
+}
+headers = {
 	"Content-Type": "application/json",
 }
 params = {
@@ -33,202 +48,321 @@ params = {
 	"limit_per_input": "20",
 }
 
-# Function to process a batch of users
-def process_user_batch(batch):
-	# Create data array with URLs from handles
-	data = []
-	for user in batch:
-		handle = user['handle']
-		# Remove @ symbol if present
-		if handle.startswith('@'):
-			handle = handle[1:]
+# Users sent per trigger; 0 puts everyone in one trigger, larger lists can be split
+# into several triggers that are polled concurrently
+USERS_PER_TRIGGER = int(os.getenv("TW_USERS_PER_TRIGGER", "0"))
+# Keep-alive connections shared by the triggers, the status polls and the downloads
+MAX_CONNECTIONS = 20
+# No overall deadline, since snapshot downloads can be large; only stalled reads time out
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
+# Connection errors and these statuses are retried with exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Methods safe to send twice; others, like the paid trigger POST, are only retried
+# when the server cannot have acted on them
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Statuses meaning a request was refused without being processed
+NOT_PROCESSED_STATUSES = {429}
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+# Longest wait honoured from a Retry-After header before giving up on the request
+RETRY_AFTER_MAX = 120
+
+# Snapshot polling backoff: first wait, growth factor, longest single wait and total budget (seconds).
+# Each can be tuned through the matching TW_POLL_* environment variable.
+POLL_INITIAL_DELAY = float(os.getenv("TW_POLL_INITIAL_DELAY", "2"))
+POLL_BACKOFF = float(os.getenv("TW_POLL_BACKOFF", "2"))
+POLL_MAX_DELAY = float(os.getenv("TW_POLL_MAX_DELAY", "60"))
+POLL_TIMEOUT = float(os.getenv("TW_POLL_TIMEOUT", "300"))
+PROGRESS_URL = "https://api.brightdata.com/datasets/v3/progress/{snapshot_id}"
+PROFILE_URL = "https://x.com/"
+
+def retry_after_seconds(response):
+	"""Seconds the server asked us to wait in its Retry-After header, or None.
+
+	The header holds either a number of seconds or an HTTP date.
+	"""
+	value = response.headers.get("Retry-After")
+	if not value:
+		return None
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		retry_at = parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		return None
+	if retry_at.tzinfo is None:
+		retry_at = retry_at.replace(tzinfo=timezone.utc)
+	return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+async def request(session, method, request_url, **kwargs):
+	"""Send a request on the shared session, retrying transient failures.
+
+	Connection errors and RETRY_STATUSES responses are retried up to
+	RETRY_ATTEMPTS times, waiting RETRY_BACKOFF * 2**attempt seconds in between.
+	Methods outside IDEMPOTENT_METHODS are retried only when the request never
+	reached the server (a failed connect) or was refused with a
+	NOT_PROCESSED_STATUSES status, so a POST that may have been acted on is
+	never sent twice. A Retry-After header on a retried response is honoured
+	instead, unless it asks for more than RETRY_AFTER_MAX seconds, in which case
+	that response is returned. The final response is returned either way; use
+	it with "async with" so its connection goes back to the pool.
+	"""
+	idempotent = method.upper() in IDEMPOTENT_METHODS
+	retry_statuses = RETRY_STATUSES if idempotent else NOT_PROCESSED_STATUSES
+	for attempt in range(RETRY_ATTEMPTS + 1):
+		delay = RETRY_BACKOFF * 2 ** attempt
+		try:
+			response = await session.request(method, request_url, **kwargs)
+		except aiohttp.ClientConnectionError as e:
+			# Any other connection error may come after the request was sent
+			if attempt == RETRY_ATTEMPTS or not (idempotent or isinstance(e, aiohttp.ClientConnectorError)):
+				raise
+			print(f"{method} {request_url} failed ({e}), retrying...")
+		else:
+			if response.status not in retry_statuses or attempt == RETRY_ATTEMPTS:
+				return response
+			retry_after = retry_after_seconds(response)
+			if retry_after is not None:
+				if retry_after > RETRY_AFTER_MAX:
+					return response
+				delay = retry_after
+			response.release()
+			print(f"{method} {request_url} returned {response.status}, retrying in {delay:.1f}s...")
+		await asyncio.sleep(delay)
+
+async def get_snapshot_status(session, snapshot_id):
+	"""Fetch a snapshot's status from the progress endpoint, or None if it cannot be read.
+
+	The progress endpoint answers with a small {"status": ...} document, so polling
+	never downloads the snapshot itself.
+	"""
+	try:
+		async with await request(session, "GET", PROGRESS_URL.format(snapshot_id=snapshot_id)) as status_response:
+			if status_response.status != 200:
+				print(f"Status check for {snapshot_id} returned {status_response.status}")
+				return None
+			status_body = await status_response.read()
+		return loads(status_body).get('status')
+	except (aiohttp.ClientError, json.JSONDecodeError) as e:
+		print(f"Error checking status of {snapshot_id}: {e}")
+		return None
+
+async def wait_for_snapshots(session, snapshot_ids):
+	"""Poll every pending snapshot together with exponential backoff.
+
+	Each round checks all pending snapshots in parallel, then sleeps once for the
+	whole group. Snapshot ids are yielded as soon as they are ready; failed ones are
+	dropped, and whatever is still pending when POLL_TIMEOUT runs out is given up.
+	"""
+	pending = list(snapshot_ids)
+	delay = POLL_INITIAL_DELAY
+	waited = 0
+	attempts = 0
+	
+	while pending and waited < POLL_TIMEOUT:
+		attempts += 1
+		print(f"Waiting {delay:.0f} seconds before checking {len(pending)} snapshots (attempt {attempts})...")
+		await asyncio.sleep(delay)
+		waited += delay
+		
+		statuses = await asyncio.gather(*(get_snapshot_status(session, snapshot_id) for snapshot_id in pending))
+		still_pending = []
+		for snapshot_id, status in zip(pending, statuses):
+			print(f"Snapshot {snapshot_id} status: {status}")
+			if status == "ready":
+				yield snapshot_id
+			elif status == "failed":
+				print(f"Snapshot {snapshot_id} failed")
+			else:
+				still_pending.append(snapshot_id)
+		pending = still_pending
 		
-		data.append({
-			"url": f"https://x.com/{handle}",
-			"start_date": start_date,
-			"end_date": ""
-		})
+		delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY, POLL_TIMEOUT - waited)
 	
-	print(f"Processing batch of {len(data)} users")
-	#print(f"API request data: {json.dumps(data, indent=2)}")
+	for snapshot_id in pending:
+		print(f"Snapshot {snapshot_id} not ready after {waited:.0f} seconds")
+
+async def trigger_snapshot(session, batch):
+	"""Start a collection for a batch of users and return its snapshot_id, or None on failure"""
+	# Create data array with URLs from handles (already stripped of @ by load_users)
+	data = [
+		{"url": PROFILE_URL + user['handle'], "start_date": start_date, "end_date": ""}
+		for user in batch
+	]
+	
+	print(f"Triggering collection for batch of {len(data)} users")
+	if DEBUG:
+		print(f"API request data: {dumps(data).decode()}")
 	
 	try:
-		#print(f"Making API request to: {url}")
-		response = requests.post(url, headers=headers, params=params, json=data)
-		print(f"API response status code: {response.status_code}")
-		print(f"API response: {response.text[:1000]}...")  # Print first 1000 chars
-		
-		response_json = response.json()
-		#print(f"Parsed response JSON: {json.dumps(response_json, indent=2)}")
-		
-		snapshot_id = response_json.get('snapshot_id')
-		if not snapshot_id:
-			print(f"Error: No snapshot_id in response")
-			return
-			
-		print(f"Got snapshot_id: {snapshot_id}")
-		snapshot_url = f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}"
-		snapshot_headers = {
-			"Authorization": "Bearer " + token
-		}
-		snapshot_params = {"format": "json"}
-		
-		print(f"Will check snapshot status at: {snapshot_url}")
-		
-		attempts = 0
-		max_attempts = 5
-		snapshot_ready = False
-		
-		while attempts < max_attempts:
-			attempts += 1
-			print(f"Waiting 40 seconds before checking snapshot status (attempt {attempts}/{max_attempts})...")
-			time.sleep(40)  # Wait for 40 seconds
-			
-			print(f"Checking snapshot status...")
-			status_response = requests.request("GET", snapshot_url, headers=snapshot_headers)
-			print(f"Status response code: {status_response.status_code}")
-			print(f"Batch status: {status_response.text}")
-			
-			if status_response.status_code == 200:
-				print(f"Snapshot is ready (status code 200)")
-				snapshot_ready = True
-				break
-			elif status_response.text == "Snapshot is empty":
-				print(f"Snapshot is empty")
-				return  # No data to save, exit the function
-			
-			if attempts == max_attempts:
-				print(f"Reached maximum attempts. Last status: {status_response.text}")
-				return  # Exit without saving if max attempts reached
+		async with await request(session, "POST", url, headers=headers, params=params, data=dumps(data)) as response:
+			print(f"API response status code: {response.status}")
+			response_body = await response.read()
+		if DEBUG:
+			print(f"API response: {response_body[:1000].decode(errors='ignore')}...")  # Print first 1000 chars
 		
-		# Only proceed to retrieve and save data if snapshot is ready
-		if snapshot_ready:
-			print(f"Snapshot is ready, retrieving data...")
-			data_response = requests.get(snapshot_url, headers=snapshot_headers, params=snapshot_params)
-			print(f"Data response status code: {data_response.status_code}")
+		snapshot_id = loads(response_body).get('snapshot_id')
+	except (aiohttp.ClientError, json.JSONDecodeError) as e:
+		print(f"Error triggering batch: {e}")
+		return None
+	
+	if not snapshot_id:
+		print(f"Error: No snapshot_id in response")
+		return None
+	
+	print(f"Got snapshot_id: {snapshot_id}")
+	return snapshot_id
+
+async def save_snapshot(session, snapshot_id):
+	"""Download a ready snapshot and append its unseen items to the saved tweets file"""
+	snapshot_url = f"https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}"
+	snapshot_params = {"format": "json"}
+	
+	try:
+		print(f"Snapshot {snapshot_id} is ready, retrieving data...")
+		# Stream the snapshot so large responses are parsed as they arrive
+		async with await request(session, "GET", snapshot_url, params=snapshot_params) as data_response:
+			print(f"Data response status code: {data_response.status}")
 			
-			if data_response.status_code != 200:
-				print(f"Error: Data response status code is not 200: {data_response.status_code}")
+			if data_response.status != 200:
+				print(f"Error: Data response status code is not 200: {data_response.status}")
 				return  # Exit without saving if response is not 200
 				
 			print(f"Data response content type: {data_response.headers.get('Content-Type', 'unknown')}")
-			print(f"Data response length: {len(data_response.text)} bytes")
-			print(f"Data response preview: {data_response.text[:500]}...")  # Print first 500 chars
+			print(f"Data response length: {data_response.headers.get('Content-Length', 'unknown')} bytes")
 			
-			# The API might return a string with multiple JSON objects, each on a new line
-			# We need to parse this properly
-			response_text = data_response.text.strip()
+			# The API returns either a JSON array or one JSON object per line;
+			# both are decoded record by record, dropping warning entries
+			print(f"Parsing response stream...")
 			new_data = []
+			async for tweet_data in aiter_json_records(data_response.content, snapshot_url):
+				if isinstance(tweet_data, dict) and 'warning' not in tweet_data:
+					new_data.append(tweet_data)
+					if DEBUG and len(new_data) <= 2:  # Print details of first two items for debugging
+						print(f"Successfully parsed item {len(new_data)}: {dumps(tweet_data)[:200].decode(errors='ignore')}...")
+		
+		print(f"Received {len(new_data)} items from API")
+		
+		if not new_data:
+			print("Warning: No valid data received from API")
+			return
 			
-			if response_text:
-				print(f"Parsing response text...")
-				# Check if the response is a JSON array or multiple JSON objects
-				if response_text.startswith('[') and response_text.endswith(']'):
-					# It's a JSON array
-					print(f"Response appears to be a JSON array")
-					new_data = json.loads(response_text)
-				else:
-					# It's multiple JSON objects, each on a new line
-					print(f"Response appears to be multiple JSON objects, parsing line by line")
-					for line_num, line in enumerate(response_text.split('\n')):
-						if line.strip():
-							try:
-								tweet_data = json.loads(line.strip())
-								# Check for warning before adding to new_data
-								if 'warning' not in tweet_data:
-									new_data.append(tweet_data)
-									if line_num < 2:  # Print details of first two items for debugging
-										print(f"Successfully parsed item {line_num+1}: {json.dumps(tweet_data)[:200]}...")
-							except json.JSONDecodeError as e:
-								print(f"Error parsing line {line_num+1}: {e}")
-								print(f"Problematic line: {line[:100]}...")
-			
-			print(f"Received {len(new_data)} items from API")
-			
-			if not new_data:
-				print("Warning: No valid data received from API")
-				return
-				
-			# Lock to prevent race conditions when writing to the file
-			with file_lock:
-				print(f"Acquired file lock, updating 001_saved_tweets.json")
-				# Load existing data if file exists
-				file_path = os.path.join(SCRIPT_DIR, pathToData, '001_saved_tweets.json')
-				print(f"File path: {file_path}")
-				
-				existing_data = []
-				try:
-					if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-						print(f"Existing file has content, parsing JSON")
-						with open(file_path, 'r') as json_file:
-							file_content = json_file.read().strip()
-							if file_content:
-								existing_data = json.loads(file_content)
-								print(f"Loaded {len(existing_data)} existing items")
-							else:
-								print(f"Existing file is empty, starting with empty list")
-					else:
-						print(f"File doesn't exist or is empty, creating new file")
-				except (FileNotFoundError, json.JSONDecodeError) as e:
-					print(f"Error reading existing file: {e}. Starting with empty list.")
-				
-				# Create a dictionary from existing data for easy lookup
-				print(f"Creating lookup dictionary from existing data")
-				existing_dict = {item.get('id', f'item_{i}'): item for i, item in enumerate(existing_data)}
-				
-				# Merge new data, replacing duplicates
-				print(f"Merging {len(new_data)} new items into existing data")
-				for item in new_data:
-					item_id = item.get('id', f'new_item_{len(existing_dict)}')
-					existing_dict[item_id] = item
-				
-				# Convert back to list
-				merged_data = list(existing_dict.values())
-				
-				# Save merged data
-				print(f"Saving {len(merged_data)} total items to file")
-				try:
-					with open(file_path, 'w') as json_file:
-						json.dump(merged_data, json_file, indent=2)
-					print(f"Successfully saved data to {file_path}")
-				except Exception as e:
-					print(f"Error saving data to file: {e}")
-				
-				print(f"Saved {len(new_data)} new items from batch. Total items: {len(merged_data)}")
+		# Append only unseen ids; the saved file is never re-read or rewritten here.
+		# Downloads share one event loop and nothing below awaits, so the dedup checks
+		# cannot interleave. save_tweets takes the file's lock (a .lock sidecar), which
+		# only waits while another process is compacting or appending to the file.
+		fresh_items = []
+		skipped_near_dups = 0
+		for item in new_data:
+			item_id = id_key(item.get('id'))
+			if item_id is not None and item_id in seen_ids:
+				continue
+			author = author_key(item)
+			if author and item.get('description') and not near_dups[author].add(item['description']):
+				skipped_near_dups += 1
+				continue
+			if item_id is not None:
+				seen_ids.add(item_id)
+			fresh_items.append(item)
+		if skipped_near_dups:
+			print(f"Skipped {skipped_near_dups} near-duplicate items")
+		
+		try:
+			save_tweets(fresh_items, str(SAVED_TWEETS_FILE))
+			print(f"Appended {len(fresh_items)} new items to {SAVED_TWEETS_FILE}")
+		except Exception as e:
+			print(f"Error saving data to file: {e}")
+		
+		print(f"Saved {len(fresh_items)} of {len(new_data)} items from snapshot {snapshot_id}. Total ids: {len(seen_ids)}")
 	except Exception as e:
-		print(f"Error processing batch: {e}")
+		print(f"Error processing snapshot {snapshot_id}: {e}")
 		import traceback
 		traceback.print_exc()
 
-# Create a lock for file operations
-file_lock = threading.Lock()
+def id_key(item_id):
+	"""Tweet ids are numeric strings; keep them as ints, which are smaller and hash to themselves"""
+	if item_id is None:
+		return None
+	try:
+		return int(item_id)
+	except (TypeError, ValueError):
+		return item_id
+
+def author_key(item):
+	"""Case-folded handle of the item's author, or None when the item does not name one"""
+	author = item.get('user_posted')
+	return author.lower() if isinstance(author, str) and author else None
+
+# Ids of everything saved so far, and description fingerprints per author, collected in one pass at startup
+seen_ids = set()
+near_dups = defaultdict(SimHashIndex)
+for item in iter_saved_tweets(str(SAVED_TWEETS_FILE)):
+	item_id = id_key(item.get('id'))
+	if item_id is not None:
+		seen_ids.add(item_id)
+	# Index existing descriptions to catch an author's reposts that differ only in links or
+	# whitespace; similar short posts by different users are distinct tweets and all kept
+	author = author_key(item)
+	if author and item.get('description'):
+		near_dups[author].add(item['description'])
+
+def load_users():
+	"""Collect users from every users file, skipping score 100 and duplicate handles.
 
-# Load users from 004_users.json
-try:
-	with open(os.path.join(SCRIPT_DIR, pathToData + users_file), 'r') as f:
-		users_data = json.load(f)
+	Handles are returned without the leading @ and compared case-insensitively.
+	"""
+	users = []
+	seen_handles = set()
+	for users_file in sorted(DATA_DIR.glob(USERS_FILE_PATTERN)):
+		try:
+			users_data = read_json(users_file)
+		except json.JSONDecodeError as e:
+			print(f"Error loading users file {users_file.name}: {e}")
+			continue
 		
-	# Filter users whose score is not 100
-	filtered_users = [user for user in users_data if user.get('score') != 100]
+		for user in users_data:
+			if user.get('score') == 100:
+				continue
+			handle = user['handle']
+			# Remove @ symbol if present
+			if handle.startswith('@'):
+				handle = handle[1:]
+			if handle.lower() in seen_handles:
+				continue
+			seen_handles.add(handle.lower())
+			users.append({**user, 'handle': handle})
+	return users
+
+async def main():
+	"""Trigger, poll and save every batch of users over one connection pool"""
+	users = load_users()
+	if not users:
+		print(f"No users found in {DATA_DIR / USERS_FILE_PATTERN}")
+		return
+	if MAX_USERS and len(users) > MAX_USERS:
+		print(f"Processing the first {MAX_USERS} of {len(users)} users (set TW_MAX_USERS to change)")
+		users = users[:MAX_USERS]
+	
+	print(f"Users who will be processed ({len(users)}):")
+	for user_index, user in enumerate(users):
+		print(f"  {user_index + 1}. {user['handle']}")
 	
-	# Split users into batches of 3
-	# batches = [filtered_users[i:i+3] for i in range(0, len(filtered_users), 3)]
-	# print(f"Processing {len(filtered_users)} users in {len(batches)} batches")
-
-	# Just take the first three users
-	first_three_users = filtered_users[:3]
-	batches = [first_three_users]
-
-	# Print the handles of all users who will be processed
-	print("Users who will be processed:")
-	for batch_index, batch in enumerate(batches):
-		print(f"Batch {batch_index + 1}:")
-		for user_index, user in enumerate(batch):
-			print(f"  {user_index + 1}. {user['handle']}")
+	batch_size = USERS_PER_TRIGGER or len(users)
+	batches = [users[i:i + batch_size] for i in range(0, len(users), batch_size)]
 	
-	# Process batches in parallel using ThreadPoolExecutor
-	with ThreadPoolExecutor(max_workers=5) as executor:  # Limit to 5 concurrent threads
-		executor.map(process_user_batch, batches)
+	connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+	async with aiohttp.ClientSession(headers=session_headers, connector=connector, timeout=HTTP_TIMEOUT) as session:
+		# Fire every trigger first, then poll all snapshots in one loop, downloading
+		# each one as soon as it is ready while the rest are still being polled
+		snapshot_ids = await asyncio.gather(*(trigger_snapshot(session, batch) for batch in batches))
+		downloads = []
+		async for snapshot_id in wait_for_snapshots(session, [sid for sid in snapshot_ids if sid]):
+			downloads.append(asyncio.create_task(save_snapshot(session, snapshot_id)))
+		await asyncio.gather(*downloads)
 	
-except (FileNotFoundError, json.JSONDecodeError) as e:
-	print(f"Error loading users file: {e}")
\ No newline at end of file
+	# Fold superseded lines back into one record per tweet once enough have built up
+	compact_saved_tweets(str(SAVED_TWEETS_FILE))
+
+asyncio.run(main())
@@ -1,39 +1,28 @@
+import asyncio
 import json
 import os
 import os.path
 
-from browser_use import Agent, Browser, Controller
-from browser_use.browser.browser import Browser
-from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+
+from ..utils.agent_runner import get_agent_runner
 
 load_dotenv()
 
+# Settings of the most recently created deck
+DECKS_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../data/decks.json")
+)
+
 
 async def create_new_deck():
-    browser = Browser()
     initial_actions = [
         {"open_tab": {"url": "https://pro.x.com"}},
     ]
 
-    # Use cookie manager for centralized cookie handling
-    cookie_manager = get_cookie_manager()
-
-    # Use script location as reference point for json file path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_file_path = os.path.join(script_dir, "../../../data/decks.json")
-    # Make the path absolute to resolve the relative components
-    json_file_path = os.path.abspath(json_file_path)
-
-    context = BrowserContext(
-        browser=browser, config=cookie_manager.create_browser_context_config()
-    )
-
-    controller = Controller()
     deck_name = "koala"
     column_type = "explore"
-    agent = Agent(
+    history = await get_agent_runner().run(
         task=(
             "Create a new deck. Name it "
             + deck_name
@@ -41,25 +30,24 @@ async def create_new_deck():
             + column_type
             + "."
         ),
-        llm=ChatOpenAI(model="gpt-4o"),
-        save_conversation_path="logs/conversation",  # Save chat logs
-        browser_context=context,
         initial_actions=initial_actions,
-        max_actions_per_step=4,
-        controller=controller,
     )
-    history = await agent.run(max_steps=10)
     result = history.final_result()
     if result:
-        with open(json_file_path, "w") as f:
+        with open(DECKS_FILE, "w") as f:
             json.dump({"deck_name": deck_name, "column_type": column_type}, f, indent=2)
-            print(f"Updated decks saved to {json_file_path}")
+            print(f"Updated decks saved to {DECKS_FILE}")
     else:
         print("No result")
         return False
-    await browser.close()
     return True
 
 
 if __name__ == "__main__":
-    create_new_deck()
+    async def main():
+        try:
+            await create_new_deck()
+        finally:
+            await get_agent_runner().close()
+
+    asyncio.run(main())
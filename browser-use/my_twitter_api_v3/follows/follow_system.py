@@ -4,30 +4,74 @@ Main following module that handles both single and bulk following operations
 """
 
 import asyncio
+import functools
 import json
 import os
+import random
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from collections import deque
+from datetime import date, datetime
+from typing import Deque, List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 
 from browser_use import Agent, Browser, Controller
 from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from ..utils.cookie_manager import get_cookie_manager
+from ..utils.agent_runner import CDP_URL, create_browser, create_context_config
+from ..utils.json_io import append_jsonl, iter_jsonl, read_json, read_json_cached, write_json
+from ..utils.llm import get_chat_llm
 
 load_dotenv()
 
+# Paths are resolved once at import rather than per follower instance
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Directory holding config.json and the accounts file; relative config paths are resolved against it
+CONFIG_DIR = os.path.normpath(os.path.join(_MODULE_DIR, "../../../.."))
+DEFAULT_CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+DATA_DIR = os.path.normpath(os.path.join(_MODULE_DIR, "../../../data"))
+# Append-only log of every successful follow, one {"handle", "followed_at"} record per line
+FOLLOWED_ACCOUNTS_FILE = os.path.join(DATA_DIR, "followed_accounts.jsonl")
+
 
 @dataclass
 class RateLimitTracker:
     """Tracks rate limits for following operations"""
     follows_today: int = 0
-    follows_this_minute: int = 0
-    last_follow_time: Optional[datetime] = None
-    minute_reset_time: Optional[datetime] = None
-    day_reset_time: Optional[datetime] = None
+    # Token bucket for the per-minute limit: up to capacity tokens,
+    # refilled continuously at refill_rate tokens per second
+    capacity: float = 0.0
+    refill_rate: float = 0.0
+    tokens: float = 0.0
+    # Admission times of the follows started in the last 60 seconds, oldest first
+    recent_follows: Deque[float] = field(default_factory=deque)
+    # time.monotonic() readings; 0.0 means not set yet
+    last_follow_ts: float = 0.0
+    last_refill_ts: float = 0.0
+    # Calendar day the daily counter belongs to
+    day: Optional[date] = None
+
+
+class Account(NamedTuple):
+    """An entry of the accounts file"""
+    handle: str
+    priority: Optional[str] = None
+    category: Optional[str] = None
+    followed: bool = False
+
+
+@functools.lru_cache(maxsize=4)
+def _load_accounts_version(path: str, mtime_ns: int) -> Tuple[Account, ...]:
+    """Parse the accounts file as of one modification time; mtime_ns only keys the cache"""
+    return tuple(
+        Account(
+            handle=entry["handle"],
+            priority=entry.get("priority"),
+            category=entry.get("category"),
+            followed=entry.get("followed", False),
+        )
+        for entry in read_json(path).get("accounts", [])
+        if "handle" in entry
+    )
 
 
 class TwitterFollower:
@@ -36,19 +80,28 @@ class TwitterFollower:
     def __init__(self, config_path: Optional[str] = None):
         """Initialize follower with configuration"""
         self.config = self._load_config(config_path)
-        self.rate_tracker = RateLimitTracker()
         self._setup_rate_limits()
+        self.rate_tracker = RateLimitTracker(
+            capacity=self.follows_per_minute,
+            refill_rate=self.follows_per_minute / 60.0,
+        )
+        
+        # Browser and contexts are created on first follow and reused until close()
+        self._browser: Optional[Browser] = None
+        self._idle_contexts: Optional[asyncio.Queue] = None
+        self._open_contexts = 0
+        self._context_config = None
+        
+        # Normalized handles already followed, loaded on first follow
+        self._followed: Optional[set] = None
     
     def _load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from config.json"""
         if config_path is None:
-            # Search for config.json starting from current file location
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(current_dir, "../../../../config.json")
+            config_path = DEFAULT_CONFIG_FILE
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return read_json_cached(config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise Exception(f"Error loading config from {config_path}: {e}")
     
@@ -65,60 +118,190 @@ class TwitterFollower:
         self.max_attempts = retry_config.get("max_attempts", 3)
         self.delay_on_error = retry_config.get("delay_on_error", 10)
         
+        # Follows allowed in flight at once during bulk runs
+        self.follow_concurrency = max(1, int(os.getenv("TW_FOLLOW_CONCURRENCY", "1")))
+        self._follow_semaphore = None
+        
         self.accounts_file = following_config.get("accounts_file", "./accounts_to_follow.json")
         
         # Make accounts file path absolute if relative
         if not os.path.isabs(self.accounts_file):
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            self.accounts_file = os.path.join(current_dir, "../../../../", self.accounts_file)
+            self.accounts_file = os.path.normpath(os.path.join(CONFIG_DIR, self.accounts_file))
     
-    def load_accounts(self) -> List[Dict[str, Any]]:
-        """Load accounts to follow from JSON file"""
+    def load_accounts(self) -> Sequence[Account]:
+        """Load accounts to follow from JSON file, reparsed only when the file changes"""
         try:
-            with open(self.accounts_file, 'r') as f:
-                data = json.load(f)
-                return data.get("accounts", [])
+            return _load_accounts_version(self.accounts_file, os.stat(self.accounts_file).st_mtime_ns)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise Exception(f"Error loading accounts from {self.accounts_file}: {e}")
     
-    def _check_rate_limits(self) -> bool:
+    def _mark_followed(self, handles: List[str]):
+        """Set followed=True for the given handles in the accounts file"""
+        # Private copy, since it is modified below
+        data = read_json(self.accounts_file)
+        
+        handles = set(handles)
+        for account in data.get("accounts", []):
+            if account.get("handle") in handles:
+                account["followed"] = True
+        
+        write_json(self.accounts_file, data)
+    
+    def get_pending_accounts(self, 
+                             filter_by_priority: Optional[str] = None,
+                             filter_by_category: Optional[str] = None) -> List[Account]:
+        """Accounts not followed yet, optionally filtered by priority and category"""
+        return [
+            account for account in self.load_accounts()
+            if not account.followed
+            and (filter_by_priority is None or account.priority == filter_by_priority)
+            and (filter_by_category is None or account.category == filter_by_category)
+        ]
+    
+    def get_follow_status(self) -> Dict[str, Any]:
+        """Summarize follow progress from the accounts file and the current rate limit usage"""
+        accounts = self.load_accounts()
+        by_priority: Dict[str, Dict[str, int]] = {}
+        by_category: Dict[str, Dict[str, int]] = {}
+        
+        for account in accounts:
+            followed = account.followed
+            for groups, key in ((by_priority, account.priority or "unknown"),
+                                (by_category, account.category or "unknown")):
+                group = groups.setdefault(key, {"total": 0, "followed": 0, "pending": 0})
+                group["total"] += 1
+                group["followed" if followed else "pending"] += 1
+        
+        followed_total = sum(1 for account in accounts if account.followed)
+        return {
+            "total_accounts": len(accounts),
+            "followed": followed_total,
+            "pending": len(accounts) - followed_total,
+            "by_priority": by_priority,
+            "by_category": by_category,
+            "rate_limits": {
+                "follows_today": self.rate_tracker.follows_today,
+                "follows_per_day": self.follows_per_day,
+                "follows_per_minute": self.follows_per_minute,
+            },
+        }
+    
+    async def _check_rate_limits(self) -> bool:
         """Check if we can follow another account based on rate limits"""
-        now = datetime.now()
+        tracker = self.rate_tracker
+        now = time.monotonic()
         
         # Reset daily counter if it's a new day
-        if (self.rate_tracker.day_reset_time is None or 
-            now >= self.rate_tracker.day_reset_time):
-            self.rate_tracker.follows_today = 0
-            self.rate_tracker.day_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-        
-        # Reset minute counter if it's a new minute
-        if (self.rate_tracker.minute_reset_time is None or 
-            now >= self.rate_tracker.minute_reset_time):
-            self.rate_tracker.follows_this_minute = 0
-            self.rate_tracker.minute_reset_time = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        today = date.today()
+        if tracker.day != today:
+            tracker.follows_today = 0
+            tracker.day = today
         
         # Check daily limit
-        if self.rate_tracker.follows_today >= self.follows_per_day:
+        if tracker.follows_today >= self.follows_per_day:
             print(f"Daily limit reached ({self.follows_per_day}). Stopping for today.")
             return False
         
-        # Check minute limit
-        if self.rate_tracker.follows_this_minute >= self.follows_per_minute:
-            wait_time = (self.rate_tracker.minute_reset_time - now).total_seconds()
+        # The bucket alone allows a full bucket plus a minute of refill within 60 seconds;
+        # the sliding window caps any 60 second span at follows_per_minute
+        window = tracker.recent_follows
+        while window and window[0] <= now - 60.0:
+            window.popleft()
+        if len(window) >= self.follows_per_minute:
+            wait_time = window[0] + 60.0 - now
             print(f"Minute limit reached ({self.follows_per_minute}). Waiting {wait_time:.1f} seconds...")
-            time.sleep(wait_time + 1)  # Add 1 second buffer
-            return self._check_rate_limits()  # Recheck after waiting
+            await asyncio.sleep(wait_time)
+            return await self._check_rate_limits()  # Recheck after waiting
         
+        # Check minute limit; a token is taken now so concurrent follows cannot share it
+        wait_time = self._take_token(now)
+        if wait_time > 0:
+            print(f"Minute limit reached ({self.follows_per_minute}). Waiting {wait_time:.1f} seconds...")
+            await asyncio.sleep(wait_time)
+            return await self._check_rate_limits()  # Recheck after waiting
+        
+        window.append(now)
         return True
     
-    def _wait_between_follows(self):
+    def _take_token(self, now: float) -> float:
+        """
+        Take one follow token from the bucket
+        
+        Returns:
+            float: 0.0 if a token was taken, otherwise seconds until one is available
+        """
+        tracker = self.rate_tracker
+        if tracker.last_refill_ts:
+            tracker.tokens = min(
+                tracker.capacity,
+                tracker.tokens + (now - tracker.last_refill_ts) * tracker.refill_rate,
+            )
+        else:
+            tracker.tokens = tracker.capacity
+        tracker.last_refill_ts = now
+        
+        if tracker.tokens >= 1:
+            tracker.tokens -= 1
+            return 0.0
+        return (1 - tracker.tokens) / tracker.refill_rate
+    
+    async def _wait_between_follows(self):
         """Wait the configured delay between follows"""
-        if self.rate_tracker.last_follow_time:
-            elapsed = (datetime.now() - self.rate_tracker.last_follow_time).total_seconds()
+        if self.rate_tracker.last_follow_ts:
+            elapsed = time.monotonic() - self.rate_tracker.last_follow_ts
             if elapsed < self.delay_between_follows:
                 wait_time = self.delay_between_follows - elapsed
                 print(f"Waiting {wait_time:.1f} seconds before next follow...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
+    
+    async def _acquire_context(self) -> BrowserContext:
+        """
+        Take an idle browser context from the pool
+        
+        Contexts are opened on the shared browser on demand, at most
+        follow_concurrency of them, so concurrent follows never share a tab.
+        Attached over CDP, every context is the browser's default one, so the
+        pool holds a single context and follows take turns.
+        """
+        if self._browser is None:
+            self._browser = create_browser()
+            self._idle_contexts = asyncio.Queue()
+        
+        max_contexts = 1 if CDP_URL else self.follow_concurrency
+        if self._idle_contexts.empty() and self._open_contexts < max_contexts:
+            self._open_contexts += 1
+            return BrowserContext(browser=self._browser, config=self._get_context_config())
+        return await self._idle_contexts.get()
+    
+    def _release_context(self, context: BrowserContext):
+        """Return a context to the pool for the next follow"""
+        self._idle_contexts.put_nowait(context)
+    
+    def _get_context_config(self):
+        """Browser context config with the account cookies, built once per follower"""
+        if self._context_config is None:
+            self._context_config = create_context_config()
+        return self._context_config
+    
+    async def close(self):
+        """Close the pooled contexts and the shared browser"""
+        if self._browser is None:
+            return
+        
+        while not self._idle_contexts.empty():
+            context = self._idle_contexts.get_nowait()
+            if CDP_URL:
+                # The attached browser's default context outlives this process
+                continue
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"Error closing browser context: {e}")
+        await self._browser.close()
+        
+        self._browser = None
+        self._idle_contexts = None
+        self._open_contexts = 0
     
     async def follow_single_account(self, handle: str) -> bool:
         """Follow a single account using browser automation"""
@@ -129,21 +312,16 @@ class TwitterFollower:
         # Remove @ for URL (Twitter URLs don't use @)
         url_handle = handle[1:] if handle.startswith('@') else handle
         
+        context = await self._acquire_context()
         try:
-            browser = Browser()
             initial_actions = [
                 {"open_tab": {"url": f"https://x.com/{url_handle}"}},
             ]
 
-            cookie_manager = get_cookie_manager()
-            context = BrowserContext(
-                browser=browser, config=cookie_manager.create_browser_context_config()
-            )
-
             controller = Controller()
             agent = Agent(
                 task=f"Follow {handle}",
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 initial_actions=initial_actions,
@@ -153,31 +331,90 @@ class TwitterFollower:
             
             history = await agent.run(max_steps=10)
             result = history.final_result()
-            await browser.close()
             
             return result is not None
             
         except Exception as e:
             print(f"Error following {handle}: {e}")
             return False
+        finally:
+            # Close only the profile tab; the context stays open for the next follow
+            try:
+                await context.close_current_tab()
+            except Exception as e:
+                print(f"Error closing tab for {handle}: {e}")
+            self._release_context(context)
+    
+    @staticmethod
+    def _normalize_handle(handle: str) -> str:
+        """Handle without the leading @, lowercased, as Twitter handles are case-insensitive"""
+        return handle.lstrip('@').lower()
+    
+    def _followed_handles(self) -> set:
+        """Handles followed so far, from the follow log and the accounts file"""
+        if self._followed is None:
+            followed = {
+                self._normalize_handle(record["handle"])
+                for record in iter_jsonl(FOLLOWED_ACCOUNTS_FILE)
+                if "handle" in record
+            }
+            try:
+                followed.update(
+                    self._normalize_handle(account.handle)
+                    for account in self.load_accounts() if account.followed
+                )
+            except Exception as e:
+                print(f"Could not read followed accounts: {e}")
+            self._followed = followed
+        return self._followed
+    
+    def _record_followed(self, handle: str):
+        """Remember a successful follow in memory and in the follow log"""
+        self._followed_handles().add(self._normalize_handle(handle))
+        os.makedirs(DATA_DIR, exist_ok=True)
+        append_jsonl(FOLLOWED_ACCOUNTS_FILE, [
+            {"handle": handle.lstrip('@'), "followed_at": datetime.now().isoformat()}
+        ])
+    
+    async def _follow_with_retries(self, handle: str) -> bool:
+        """
+        Attempt a follow up to max_attempts times
+        
+        Retries back off exponentially from delay_on_error, capped at 60 seconds,
+        with up to a second of random jitter so parallel workers do not retry in step.
+        """
+        for attempt in range(self.max_attempts):
+            if await self.follow_single_account(handle):
+                return True
+            if attempt + 1 < self.max_attempts:
+                delay = min(60, self.delay_on_error * 2 ** attempt) + random.uniform(0, 1)
+                print(f"Retrying @{handle} in {delay:.1f} seconds (attempt {attempt + 2}/{self.max_attempts})...")
+                await asyncio.sleep(delay)
+        return False
     
     async def follow_user(self, handle: str) -> bool:
         """
         Follow a single user with rate limiting
         Main interface for following individual accounts
+        
+        Handles that were already followed return True without running an agent.
         """
-        if not self._check_rate_limits():
+        if self._normalize_handle(handle) in self._followed_handles():
+            print(f"Already following @{handle.lstrip('@')}, skipping")
+            return True
+        
+        if not await self._check_rate_limits():
             print("Rate limits exceeded. Cannot follow user at this time.")
             return False
         
-        self._wait_between_follows()
+        await self._wait_between_follows()
         
-        success = await self.follow_single_account(handle)
+        success = await self._follow_with_retries(handle)
         
         if success:
             self.rate_tracker.follows_today += 1
-            self.rate_tracker.follows_this_minute += 1
-            self.rate_tracker.last_follow_time = datetime.now()
+            self.rate_tracker.last_follow_ts = time.monotonic()
+            self._record_followed(handle)
             print(f"✓ Successfully followed @{handle}")
         else:
             print(f"✗ Failed to follow @{handle}")
@@ -185,6 +422,57 @@ class TwitterFollower:
         return success
 
 
+    async def follow_accounts_bulk(self,
+                                   filter_by_priority: Optional[str] = None,
+                                   filter_by_category: Optional[str] = None,
+                                   max_accounts: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Follow pending accounts from the accounts file with rate limiting
+        
+        At most follow_concurrency follows run at once, shared across concurrent
+        bulk calls. Accounts followed successfully are marked in the accounts file.
+        
+        Args:
+            filter_by_priority: Only follow accounts with this priority
+            filter_by_category: Only follow accounts in this category
+            max_accounts: Maximum number of accounts to attempt
+            
+        Returns:
+            Dict with followed, failed and skipped counts and per-account details
+        """
+        pending = self.get_pending_accounts(filter_by_priority, filter_by_category)
+        if max_accounts is not None:
+            pending = pending[:max_accounts]
+        
+        if self._follow_semaphore is None:
+            self._follow_semaphore = asyncio.Semaphore(self.follow_concurrency)
+        
+        results = {"followed": 0, "failed": 0, "skipped": 0, "details": []}
+        
+        async def follow_one(account: Account):
+            async with self._follow_semaphore:
+                if self.rate_tracker.follows_today >= self.follows_per_day:
+                    status = "skipped"
+                else:
+                    status = "followed" if await self.follow_user(account.handle) else "failed"
+            
+            results[status] += 1
+            results["details"].append({
+                "handle": account.handle,
+                "priority": account.priority,
+                "category": account.category,
+                "status": status,
+            })
+        
+        await asyncio.gather(*(follow_one(account) for account in pending))
+        
+        followed_handles = [d["handle"] for d in results["details"] if d["status"] == "followed"]
+        if followed_handles:
+            self._mark_followed(followed_handles)
+        
+        return results
+
+
 # Convenience functions for easy importing
 _follower_instance = None
 
@@ -195,8 +483,15 @@ def get_follower() -> TwitterFollower:
         _follower_instance = TwitterFollower()
     return _follower_instance
 
+async def close_follower():
+    """Close the global follower's browser and pooled contexts, and reset the instance"""
+    global _follower_instance
+    if _follower_instance is not None:
+        await _follower_instance.close()
+        _follower_instance = None
+
 async def follow_user(handle: str) -> bool:
-    """Convenience function to follow a single user"""
+    """Convenience function to follow a single user; await close_follower() when done"""
     follower = get_follower()
     return await follower.follow_user(handle)
 
@@ -211,6 +506,7 @@ if __name__ == "__main__":
             print(f"Following user: {handle}")
             success = await follow_user(handle)
             print(f"Result: {'Success' if success else 'Failed'}")
+            await close_follower()
         else:
             print("Usage: python follow_system.py <handle>")
             print("Example: python follow_system.py elonmusk")
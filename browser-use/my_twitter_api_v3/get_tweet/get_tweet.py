@@ -1,14 +1,16 @@
-import json
+import asyncio
 import os
 import os.path
+from typing import List, Optional
 
-from browser_use import Agent, Browser, Controller
-from browser_use.browser.browser import Browser
+from browser_use import Controller
 from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
+from ..utils.agent_runner import TwitterAgentRunner, get_agent_runner
+from ..utils.tweet_store import save_tweets
+
 load_dotenv()
 
 
@@ -29,60 +31,45 @@ SCRIPT_DIR = os.path.dirname(__file__)
 
 pathToData = "../../../data"
 aboutMe = "/000_about_me.json"
-lastSavedTweets = "/001_saved_tweets.json"
+lastSavedTweets = "/001_saved_tweets.jsonl"
 
+# Upper bound in seconds for one extraction run, so a stuck page cannot stall a batch
+AGENT_TIMEOUT = 45
 
 async def get_tweet(
     post_url="https://twitter.com/TheBabylonBee/status/1903616058562576739",
+    browser_context: Optional[BrowserContext] = None,
+    runner: Optional[TwitterAgentRunner] = None,
 ):
     initial_actions = [
         {"open_tab": {"url": post_url}},  # Use the provided tweet URL
     ]
 
-    # Use cookie manager for centralized cookie handling
-    cookie_manager = get_cookie_manager()
-
-    # Use script location as reference point for json file path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_file_path = os.path.join(script_dir, "../../../data/saved_tweets.json")
-    # Make the path absolute to resolve the relative components
-    json_file_path = os.path.abspath(json_file_path)
-
-    browser = Browser()
-    controller = Controller(output_model=Tweet)
-    context = BrowserContext(
-        browser=browser, config=cookie_manager.create_browser_context_config()
-    )
-
-    agent = Agent(
-        task=(
-            "Extract the tweet's: text, likes total, retweet total, reply total, bookmark total, tweet_link, the author's handle, the datetime it was psoted, and its viewcount"
-        ),
-        llm=ChatOpenAI(model="gpt-4o"),
-        save_conversation_path="logs/conversation",  # Save chat logs
-        browser_context=context,
-        initial_actions=initial_actions,
-        max_actions_per_step=6,
-        controller=controller,
-    )
-    history = await agent.run(max_steps=6)
+    # Run in the caller's browser context when given, otherwise in a fresh context
+    # on the runner's browser, which stays open for the next tweet
+    runner = runner or get_agent_runner()
+    try:
+        history = await asyncio.wait_for(
+            runner.run(
+                task=(
+                    "Extract the tweet's: text, likes total, retweet total, reply total, bookmark total, tweet_link, the author's handle, the datetime it was psoted, and its viewcount"
+                ),
+                initial_actions=initial_actions,
+                max_steps=6,
+                max_actions_per_step=6,
+                controller=Controller(output_model=Tweet),
+                browser_context=browser_context,
+            ),
+            timeout=AGENT_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        print(f"Timed out after {AGENT_TIMEOUT}s extracting {post_url}")
+        return False
+
     result = history.final_result()
     if result:
         parsed: Tweet = Tweet.model_validate_json(result)
         print(parsed)
-        try:
-            # Load existing tweets from JSON file if it exists
-            existing_tweets = []
-            with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "r") as f:
-                data = json.load(f)
-                existing_tweets = data.get("tweets", [])
-        except FileNotFoundError:
-            print("No existing tweets found. Starting with empty list.")
-            existing_tweets = []
-        except json.JSONDecodeError:
-            print("Error reading existing tweets file. Starting with empty list.")
-            existing_tweets = []
-
         # Create a dictionary representation of the tweet
         tweet_dict = {
             "handle": parsed.handle,
@@ -96,28 +83,55 @@ async def get_tweet(
             "viewcount": parsed.viewcount,
         }
 
-        # Check if the tweet's URL matches the post_url and update or add it
-        updated = False
-        print(existing_tweets)
-        for i, existing in enumerate(existing_tweets):
-            if existing["tweet_url"] == tweet_dict["tweet_url"]:
-                existing_tweets[i] = tweet_dict
-                updated = True
-                print(f"Updated tweet from {tweet_dict['handle']} at {post_url}")
-                break
-
-        if not updated:
-            existing_tweets.append(tweet_dict)
-            print(f"Added new tweet from {tweet_dict['handle']} at {post_url}")
-
-        # Save updated tweets list
-        with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "w") as f:
-            json.dump({"tweets": existing_tweets}, f, indent=2)
-            print("Updated tweets saved.")
+        # Append only; readers collapse records for the same tweet_url
+        save_tweets([tweet_dict], os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets))
+        print(f"Saved tweet from {tweet_dict['handle']} at {post_url}")
     else:
         print("No result")
     return True
 
 
+async def get_tweets(post_urls: List[str], concurrency: int = 3):
+    """
+    Fetch several tweets concurrently through one shared browser
+
+    Chromium starts once for the whole batch through a runner owned by this
+    call, and is closed when the batch ends. Each fetch runs in its own
+    BrowserContext so agents do not share tabs, and at most concurrency
+    agents run at the same time.
+
+    Args:
+        post_urls: URLs of the tweets to fetch
+        concurrency: Maximum number of agents running at once
+
+    Returns:
+        One result per URL: True on success or the exception that was raised
+    """
+    runner = TwitterAgentRunner()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(post_url):
+        async with semaphore:
+            return await get_tweet(post_url, runner=runner)
+
+    try:
+        results = await asyncio.gather(
+            *(fetch(post_url) for post_url in post_urls), return_exceptions=True
+        )
+    finally:
+        await runner.close()
+
+    for post_url, result in zip(post_urls, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching {post_url}: {result}")
+    return results
+
+
 if __name__ == "__main__":
-    get_tweet()
+    async def main():
+        try:
+            await get_tweet()
+        finally:
+            await get_agent_runner().close()
+
+    asyncio.run(main())
@@ -1,9 +1,11 @@
+import atexit
 import json
-import time
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 from pydantic import BaseModel
 
+from ..utils.agent_runner import CHROMIUM_ARGS, WINDOW_SIZE, is_headless
 from ..utils.cookie_manager import load_cookies
 
 
@@ -15,60 +17,106 @@ class Tweets(BaseModel):
     tweets: list[Tweet]
 
 
-def get_list_posts(list_id="1903856475812045303"):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Set to False to see browser
-        context = browser.new_context()
-        page = context.new_page()
+# Saved tweet layout with empty placeholders, copied for each scraped URL
+_TWEET_TEMPLATE = {
+    "handle": "",
+    "datetime": "",
+    "text": "",
+    "likes": "",
+    "retweets": "",
+    "replies": "",
+    "bookmarks": "",
+    "viewcount": "",
+    "tweet_url": "",
+}
+
+# Longest wait in milliseconds for more tweets to render after scrolling
+SCROLL_LOAD_TIMEOUT_MS = 3000
+
+# Collects tweet links in the page in one round trip: photo and analytics
+# suffixes are stripped and duplicates dropped in the browser
+_TWEET_URLS_JS = r"""
+() => [...new Set(
+    [...document.querySelectorAll("article a[href*='/status/']")]
+        .map(a => a.getAttribute("href"))
+        .filter(Boolean)
+        .map(href => "https://twitter.com" + href.replace(/\/(photo\/[12]|analytics)$/, ""))
+)]
+"""
+
+# Resource types the scrape never reads; only the article markup and its links matter
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Playwright driver and logged-in browser context, started on first use and
+# kept for later calls so each one only opens a new page. While the sync driver
+# runs, its event loop counts as running on this thread and asyncio.run fails
+# there, so callers that go on to async work must call close_browser first;
+# a process that scrapes once gains nothing from keeping it.
+_playwright = None
+_context = None
+
+
+def _block_heavy_resources(route):
+    """Abort requests for BLOCKED_RESOURCE_TYPES and let everything else through"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _get_context():
+    """Return the shared browser context, launching the browser and loading cookies once"""
+    global _playwright, _context
+    if _context is None:
+        _playwright = sync_playwright().start()
+        atexit.register(close_browser)
+        # Set browser.headless to false in config.json to watch the scrape
+        browser = _playwright.chromium.launch(headless=is_headless(), args=CHROMIUM_ARGS)
+        _context = browser.new_context(viewport=WINDOW_SIZE)
+        _context.add_cookies(load_cookies())
+        _context.route("**/*", _block_heavy_resources)
+    return _context
+
+
+def close_browser():
+    """Close the shared browser and stop the Playwright driver"""
+    global _playwright, _context
+    if _context is not None:
+        _context.browser.close()
+        _context = None
+    if _playwright is not None:
+        _playwright.stop()
+        _playwright = None
 
-        # Load cookies
-        cookies = load_cookies()
-        context.add_cookies(cookies)
 
+def get_list_posts(list_id="1903856475812045303"):
+    page = _get_context().new_page()
+    try:
         # Navigate to Twitter List
         page.goto(f"https://twitter.com/i/lists/{list_id}", wait_until="load")
 
         # Wait for tweets to load
         page.wait_for_selector("article")
 
-        # Scroll once to load more content
+        # Scroll once to load more content, continuing as soon as a new tweet renders
+        article_count = page.evaluate("document.querySelectorAll('article').length")
         page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-        time.sleep(3)  # Wait for new tweets to load
-
-        # Extract tweet URLs - fix the selector line
-        tweet_urls = set()
-        tweets = page.query_selector_all("article a[href*='/status/']")
-
-        for tweet in tweets:
-            href = tweet.get_attribute("href")
-            if href:
-                full_url = "https://twitter.com" + href
-                tweet_urls.add(full_url)
-
-        browser.close()
-
-    # Create a list to hold tweet dictionaries
-    tweet_dicts = []
-
-    for url in tweet_urls:
-        if url.endswith("/photo/1"):
-            url = url[: -len("/photo/1")]
-        elif url.endswith("/photo/2"):
-            url = url[: -len("/photo/2")]
-        elif url.endswith("/analytics"):
-            url = url[: -len("/analytics")]
-        tweet_dict = {
-            "handle": "",  # Placeholder for the tweet handle
-            "datetime": "",  # Placeholder for the tweet datetime
-            "text": "",  # Placeholder for the tweet text
-            "likes": "",  # Placeholder for the number of likes
-            "retweets": "",  # Placeholder for the number of retweets
-            "replies": "",  # Placeholder for the number of replies
-            "bookmarks": "",  # Placeholder for the number of bookmarks
-            "viewcount": "",  # Placeholder for the view count
-            "tweet_url": url,  # The tweet URL
-        }
-        tweet_dicts.append(tweet_dict)
+        try:
+            page.wait_for_function(
+                "count => document.querySelectorAll('article').length > count",
+                arg=article_count,
+                timeout=SCROLL_LOAD_TIMEOUT_MS,
+            )
+        except PlaywrightTimeoutError:
+            pass  # Nothing more loaded; use the tweets already on the page
+
+        # Extract tweet URLs
+        tweet_urls = page.evaluate(_TWEET_URLS_JS)
+    finally:
+        page.close()
+
+    # One placeholder record per URL; the other fields are filled in by get_tweet later
+    tweet_dicts = [{**_TWEET_TEMPLATE, "tweet_url": url} for url in tweet_urls]
 
     # Create a structured data object
     parsed = {"tweets": tweet_dicts}
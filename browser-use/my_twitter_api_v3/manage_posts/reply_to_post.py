@@ -1,60 +1,77 @@
+import argparse
+import asyncio
 import json
 import os
 import os.path
 from datetime import datetime
+from typing import Any, Dict, Iterator
 
-from browser_use import Agent, Browser, Controller
-from browser_use.browser.browser import Browser
-from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
-from ..utils.cookie_manager import get_cookie_manager
+from ..utils.agent_runner import STEP_BUDGETS, get_agent_runner, run_many
+from ..utils.json_io import append_jsonl, iter_jsonl, read_json
 
 load_dotenv()
 
+# Posted replies, one JSON object per line, so recording a reply never rewrites earlier ones
+POSTED_REPLIES_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../data/003_posted_tweets.jsonl")
+)
+
+
+def load_all_replies(path: str = POSTED_REPLIES_FILE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream recorded replies, oldest first
+
+    Replies in a legacy 003_posted_tweets.json next to path, a JSON array or a
+    single object, are yielded before the JSON Lines records. create_post still
+    writes its last post to that file, so only records naming the tweet replied to
+    are taken from it.
+
+    Args:
+        path: Path to the posted replies JSON Lines file
+
+    Returns:
+        Iterator over {"initial_tweet_url", "reply_text", "reply_time"} dicts
+    """
+    legacy_path = os.path.splitext(path)[0] + ".json"
+    try:
+        legacy = read_json(legacy_path)
+    except FileNotFoundError:
+        legacy = []
+    except json.JSONDecodeError:
+        print(f"Skipping unreadable {legacy_path}")
+        legacy = []
+    if not isinstance(legacy, list):
+        legacy = [legacy]
+    for record in legacy:
+        if isinstance(record, dict) and record.get("initial_tweet_url") and "reply_text" in record:
+            yield record
+
+    yield from iter_jsonl(path)
+
 
 async def reply_to_post(
-    my_post="gross", tweet_url="https://x.com/SolJakey/status/1903232593254027508"
+    my_post="gross",
+    tweet_url="https://x.com/SolJakey/status/1903232593254027508",
+    reply_time=None,
 ):
-    browser = Browser()
     initial_actions = [
         {"open_tab": {"url": tweet_url}},
         {"scroll_down": {"amount": 200}},
     ]
 
-    # Use cookie manager for centralized cookie handling
-    cookie_manager = get_cookie_manager()
-
-    # Use script location as reference point for json file path
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_file_path = os.path.join(script_dir, "../../../data/003_posted_tweets.json")
-    # Make the path absolute to resolve the relative components
-    json_file_path = os.path.abspath(json_file_path)
-
-    controller = Controller()
-    context = BrowserContext(
-        browser=browser, config=cookie_manager.create_browser_context_config()
-    )
-
-    agent = Agent(
-        task=(
-            "Reply to the tweet with: "
-            + my_post
-            + " and then make sure to click the reply button."
-        ),
-        llm=ChatOpenAI(model="gpt-4o-mini"),
-        save_conversation_path="logs/conversation",  # Save chat logs
-        browser_context=context,
+    history = await get_agent_runner().run(
+        task=f"Reply to the tweet with: {my_post} and then make sure to click the reply button.",
         initial_actions=initial_actions,
-        max_actions_per_step=4,
-        controller=controller,
+        model="gpt-4o-mini",
+        max_steps=STEP_BUDGETS["reply_to_post"],
     )
-    history = await agent.run(max_steps=10)
     result = history.final_result()
     if result:
-        # Get current timestamp
-        reply_time = datetime.now().isoformat()
+        # Keep the caller's timestamp so the draft and posted records agree
+        if reply_time is None:
+            reply_time = datetime.now().isoformat()
 
         # Prepare data to save
         tweet_data = {
@@ -63,25 +80,9 @@ async def reply_to_post(
             "reply_time": reply_time,
         }
 
-        # Load existing data if file exists
-        existing_data = []
-        if os.path.exists(json_file_path) and os.path.getsize(json_file_path) > 0:
-            try:
-                with open(json_file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Convert to list if it's a single object
-                    if not isinstance(existing_data, list):
-                        existing_data = [existing_data]
-            except json.JSONDecodeError:
-                print("Error reading existing file. Starting with empty list.")
-
-        # Append new data
-        existing_data.append(tweet_data)
-
-        # Save updated data
-        with open(json_file_path, "w") as f:
-            json.dump(existing_data, f, indent=2)
-            print(f"Updated tweet data saved to {json_file_path}")
+        # Append only; load_all_replies reads the records back
+        append_jsonl(POSTED_REPLIES_FILE, [tweet_data])
+        print(f"Reply recorded in {POSTED_REPLIES_FILE}")
     else:
         print("No result")
         return False
@@ -89,4 +90,28 @@ async def reply_to_post(
 
 
 if __name__ == "__main__":
-    reply_to_post()
+    parser = argparse.ArgumentParser(description="Reply to tweets")
+    parser.add_argument(
+        "--reply",
+        nargs=2,
+        action="append",
+        metavar=("TWEET_URL", "TEXT"),
+        help="Tweet to reply to and the reply text; repeat to post several replies concurrently",
+    )
+    args = parser.parse_args()
+
+    async def main():
+        try:
+            if args.reply:
+                results = await run_many(
+                    reply_to_post(my_post=text, tweet_url=tweet_url) for tweet_url, text in args.reply
+                )
+                for (tweet_url, _), result in zip(args.reply, results):
+                    if isinstance(result, Exception):
+                        print(f"Error replying to {tweet_url}: {result}")
+            else:
+                await reply_to_post()
+        finally:
+            await get_agent_runner().close()
+
+    asyncio.run(main())
@@ -14,6 +14,8 @@ import random
 from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
+from .utils.json_io import read_json, write_json
+
 
 @dataclass
 class PersonaContext:
@@ -64,8 +66,7 @@ class PersonaManager:
             bool: True if successful, False otherwise
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.persona_data = json.load(f)
+            self.persona_data = read_json(file_path)
             
             # Create persona context
             self.persona_context = self._create_persona_context(self.persona_data)
@@ -365,8 +366,7 @@ Make the reply feel natural with the media, as if {self.persona_context.agent_na
             return False
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.persona_data, f, indent=2)
+            write_json(file_path, self.persona_data)
             return True
         except Exception as e:
             print(f"Error saving persona data: {e}")
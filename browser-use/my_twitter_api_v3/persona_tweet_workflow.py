@@ -18,11 +18,12 @@ from typing import Dict, List, Any, Optional, Tuple, Union
 from browser_use import Agent, Browser, Controller
 from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 from .tweet_generator import TweetGenerator
 from .media_manager import MediaManager
 from .utils.cookie_manager import get_cookie_manager
+from .utils.json_io import read_json
+from .utils.llm import get_chat_llm
 from .manage_posts.create_post import create_post
 
 load_dotenv()
@@ -74,8 +75,7 @@ class PersonaTweetWorkflow:
             config_path = os.path.join(current_dir, "../../../config.json")
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return read_json(config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading config from {config_path}: {e}")
             return {}
@@ -297,7 +297,7 @@ class PersonaTweetWorkflow:
             # Create agent for timeline monitoring
             agent = Agent(
                 task="Monitor Twitter timeline and interact with relevant content",
-                llm=ChatOpenAI(model=self.llm_model),
+                llm=get_chat_llm(self.llm_model),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 max_actions_per_step=4,
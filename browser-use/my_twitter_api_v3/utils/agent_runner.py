@@ -0,0 +1,204 @@
+"""
+Shared agent runner for Twitter API v3
+One browser and one LLM client per model serve every one-off task, instead of a cold start per call
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+
+from browser_use import Agent, Browser, BrowserConfig, Controller
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+from .cookie_manager import get_cookie_manager
+from .llm import get_chat_llm
+
+# DevTools endpoint of an already running Chromium, e.g. one started with
+# --remote-debugging-port=9222. When set, every process attaches to that browser
+# instead of launching its own, and closing only disconnects. browser-use attaches
+# to that browser's default context rather than opening a new one, so tasks in a
+# process then take turns in one shared context that is never closed.
+CDP_URL = os.getenv("TW_CDP_URL")
+# Agents run_many lets run at once, each holding its own browser context
+MAX_CONCURRENT_TASKS = int(os.getenv("TW_MAX_CONCURRENT_TASKS", "8"))
+# Step limits for flows that finish in a few steps; the agent stops on its done
+# action, so these only cut off runs that wander, whose history would otherwise
+# keep growing every prompt. Other tasks use run()'s max_steps default.
+STEP_BUDGETS = {
+    "create_post": 4,
+    "reply_to_post": 5,
+    "create_list": 6,
+}
+# Chromium flags that skip GPU, extension and background work at startup and
+# avoid running out of /dev/shm in containers
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+]
+# Window size for new contexts; smaller than browser-use's default, so pages lay out faster
+WINDOW_SIZE = {"width": 1280, "height": 800}
+
+
+def is_headless() -> bool:
+    """Headless setting from the "browser" section of config.json; headless unless set to false"""
+    return get_cookie_manager().get_config().get("browser", {}).get("headless", True)
+
+
+def create_browser() -> Browser:
+    """
+    Create a Browser, attached to the shared Chromium at TW_CDP_URL when configured
+
+    Otherwise Chromium is launched with CHROMIUM_ARGS, headless unless config.json
+    sets browser.headless to false.
+
+    Returns:
+        Browser instance; it starts or connects on first use
+    """
+    if CDP_URL:
+        return Browser(config=BrowserConfig(cdp_url=CDP_URL))
+    return Browser(config=BrowserConfig(headless=is_headless(), extra_chromium_args=CHROMIUM_ARGS))
+
+
+def create_context_config() -> BrowserContextConfig:
+    """
+    Browser context config with the account cookies and WINDOW_SIZE
+
+    Returns:
+        BrowserContextConfig instance
+    """
+    return get_cookie_manager().create_browser_context_config(browser_window_size=WINDOW_SIZE)
+
+
+class TwitterAgentRunner:
+    """Runs browser-use agents on a lazily started, shared browser"""
+
+    def __init__(self):
+        self._browser: Optional[Browser] = None
+        self._context_config: Optional[BrowserContextConfig] = None
+        # CDP mode only: the attached default context and the lock taking turns in it,
+        # created inside the running event loop
+        self._shared_context: Optional[BrowserContext] = None
+        self._shared_lock: Optional[asyncio.Lock] = None
+
+    def _get_browser(self) -> Browser:
+        """Start the shared browser on first use"""
+        if self._browser is None:
+            self._browser = create_browser()
+            self._context_config = create_context_config()
+        return self._browser
+
+    async def run(self,
+                  task: str,
+                  initial_actions: List[Dict[str, Any]],
+                  model: str = "gpt-4o",
+                  max_steps: int = 10,
+                  max_actions_per_step: int = 4,
+                  controller: Optional[Controller] = None,
+                  browser_context: Optional[BrowserContext] = None,
+                  **agent_kwargs):
+        """
+        Run one agent task in a fresh context on the shared browser
+
+        With TW_CDP_URL set, tasks instead run one at a time in the attached browser's
+        default context, which is left open for the next task.
+
+        Args:
+            task: Task description for the agent
+            initial_actions: Actions run before the agent starts
+            model: OpenAI model name
+            max_steps: Maximum number of agent steps
+            max_actions_per_step: Maximum number of actions per step
+            controller: Controller for the agent, e.g. one with an output model
+            browser_context: Caller-owned context to run in instead of a fresh one
+            **agent_kwargs: Extra arguments passed to Agent
+
+        Returns:
+            AgentHistoryList: History of the agent run
+        """
+        def run_in(context: BrowserContext):
+            agent = Agent(
+                task=task,
+                llm=get_chat_llm(model),
+                save_conversation_path="logs/conversation",  # Save chat logs
+                browser_context=context,
+                initial_actions=initial_actions,
+                max_actions_per_step=max_actions_per_step,
+                controller=controller or Controller(),
+                **agent_kwargs,
+            )
+            return agent.run(max_steps=max_steps)
+
+        if browser_context is not None:
+            return await run_in(browser_context)
+
+        if CDP_URL:
+            # Closing this context would close the attached browser's default context
+            # under every other task, so it is created once and never closed here
+            if self._shared_lock is None:
+                self._shared_lock = asyncio.Lock()
+            async with self._shared_lock:
+                if self._shared_context is None:
+                    self._shared_context = BrowserContext(browser=self._get_browser(), config=self._context_config)
+                return await run_in(self._shared_context)
+
+        context = BrowserContext(browser=self._get_browser(), config=self._context_config)
+        try:
+            return await run_in(context)
+        finally:
+            await context.close()
+
+    async def start(self):
+        """Launch the shared browser, or connect to it, ahead of the first task"""
+        await self._get_browser().get_playwright_browser()
+
+    async def close(self):
+        """Close the shared browser, or disconnect from it in CDP mode"""
+        self._shared_context = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+
+# Global instance for easy access
+_agent_runner = None
+
+
+def get_agent_runner() -> TwitterAgentRunner:
+    """
+    Get the global agent runner instance
+
+    Returns:
+        TwitterAgentRunner instance
+    """
+    global _agent_runner
+    if _agent_runner is None:
+        _agent_runner = TwitterAgentRunner()
+    return _agent_runner
+
+
+async def run_many(tasks: Iterable[Awaitable[Any]],
+                   concurrency: int = MAX_CONCURRENT_TASKS) -> List[Any]:
+    """
+    Await agent tasks concurrently, at most concurrency at a time
+
+    Tasks built on the shared runner all use its one browser, each in its own context;
+    in CDP mode the runner lets them through one at a time.
+
+    Args:
+        tasks: Coroutines to run, such as create_post(...) calls
+        concurrency: Maximum number of tasks running at once
+
+    Returns:
+        One result per task, in order: its return value or the exception it raised
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(task: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await task
+
+    return await asyncio.gather(*(bounded(task) for task in tasks), return_exceptions=True)
@@ -9,6 +9,8 @@ import pathlib
 from typing import List, Dict, Any, Optional
 from browser_use.browser.context import BrowserContextConfig
 
+from .json_io import read_json
+
 
 class CookieManager:
     """Manages Twitter cookies with configurable file location"""
@@ -22,6 +24,8 @@ class CookieManager:
         """
         self.config = self._load_config(config_path)
         self.cookie_file_path = self._resolve_cookie_path()
+        # Parsed cookies, read on the first load_cookies() call
+        self._cookies: Optional[List[Dict[str, Any]]] = None
     
     def _load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from config.json"""
@@ -47,8 +51,7 @@ class CookieManager:
                 )
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return read_json(config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise Exception(f"Error loading config from {config_path}: {e}")
     
@@ -67,12 +70,30 @@ class CookieManager:
         """
         Load Twitter cookies from the configured JSON file
         
+        The file is parsed once; later calls return the same list until
+        reload_cookies() is called.
+        
         Returns:
             List of cookie dictionaries compatible with browser automation
         """
+        if self._cookies is None:
+            self._cookies = self._read_cookies()
+        return self._cookies
+    
+    def reload_cookies(self) -> List[Dict[str, Any]]:
+        """
+        Re-read the cookie file, e.g. after logging in again
+        
+        Returns:
+            List of cookie dictionaries compatible with browser automation
+        """
+        self._cookies = None
+        return self.load_cookies()
+    
+    def _read_cookies(self) -> List[Dict[str, Any]]:
+        """Parse and normalize the cookie file"""
         try:
-            with open(self.cookie_file_path, 'r') as f:
-                cookies_data = json.load(f)
+            cookies_data = read_json(self.cookie_file_path)
             
             # Ensure cookies_data is a list
             if not isinstance(cookies_data, list):
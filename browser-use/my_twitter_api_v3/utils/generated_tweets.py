@@ -0,0 +1,149 @@
+"""
+SQLite storage for generated tweet replies
+Each selected reply is a single inserted row, so saving never rewrites earlier replies
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterator
+
+from .json_io import read_json, write_json_array
+
+DATA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../data")
+)
+GENERATED_TWEETS_DB = os.path.join(DATA_DIR, "002_generated_tweets.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generated_tweets (
+    id INTEGER PRIMARY KEY,
+    tweet_text TEXT,
+    tweet_url TEXT,
+    reply_text TEXT,
+    date_created INTEGER
+)
+"""
+_INSERT = (
+    "INSERT INTO generated_tweets (tweet_text, tweet_url, reply_text, date_created) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+def _migrate_legacy_file(conn: sqlite3.Connection, path: str) -> None:
+    """
+    Import the legacy 002_generated_tweets.json next to path into a new database
+
+    Entries keep their original date_created, which is an ISO string for replies
+    saved before timestamps became epoch nanoseconds.
+    """
+    legacy_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(legacy_path):
+        return
+
+    try:
+        records = read_json(legacy_path)
+    except ValueError as e:
+        print(f"Could not migrate {legacy_path}: {e}")
+        return
+    if not isinstance(records, list):
+        records = [records]
+
+    rows = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        reply = record.get("reply") or {}
+        rows.append((
+            record.get("tweet_text"),
+            record.get("tweet_url"),
+            reply.get("tweet_text"),
+            reply.get("date_created"),
+        ))
+    conn.executemany(_INSERT, rows)
+    print(f"Migrated {len(rows)} generated tweets from {legacy_path} to {path}")
+
+
+def connect(path: str = GENERATED_TWEETS_DB) -> sqlite3.Connection:
+    """
+    Open the generated tweets database, creating it on first use
+
+    A new database is seeded from the legacy JSON archive if one exists.
+
+    Args:
+        path: Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Open connection; the caller closes it
+    """
+    is_new = not os.path.exists(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Other flows may be writing at the same time; wait for their lock instead of failing
+    conn = sqlite3.connect(path, timeout=30)
+    with conn:
+        conn.execute(_SCHEMA)
+        if is_new:
+            _migrate_legacy_file(conn, path)
+    return conn
+
+
+def save_generated_tweet(tweet_text: str,
+                         tweet_url: str,
+                         reply_text: str,
+                         date_created: int,
+                         path: str = GENERATED_TWEETS_DB) -> None:
+    """
+    Record a selected reply
+
+    Args:
+        tweet_text: Text of the tweet being replied to
+        tweet_url: URL of the tweet being replied to
+        reply_text: The selected reply
+        date_created: Selection time in epoch nanoseconds
+        path: Path to the SQLite database file
+    """
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute(_INSERT, (tweet_text, tweet_url, reply_text, date_created))
+    finally:
+        conn.close()
+
+
+def iter_generated_tweets(path: str = GENERATED_TWEETS_DB) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over saved replies, oldest first, in the legacy JSON layout
+
+    Args:
+        path: Path to the SQLite database file
+
+    Returns:
+        Iterator over {"tweet_text", "tweet_url", "reply": {"tweet_text", "date_created"}} dicts
+    """
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT tweet_text, tweet_url, reply_text, date_created FROM generated_tweets ORDER BY id"
+        )
+        for tweet_text, tweet_url, reply_text, date_created in rows:
+            yield {
+                "tweet_text": tweet_text,
+                "tweet_url": tweet_url,
+                "reply": {"tweet_text": reply_text, "date_created": date_created},
+            }
+    finally:
+        conn.close()
+
+
+def export_generated_tweets(json_path: str, path: str = GENERATED_TWEETS_DB) -> int:
+    """
+    Write every saved reply to a JSON file in the legacy 002_generated_tweets.json layout
+
+    Args:
+        json_path: Destination JSON file
+        path: Path to the SQLite database file
+
+    Returns:
+        int: Number of exported replies
+    """
+    return write_json_array(json_path, iter_generated_tweets(path))
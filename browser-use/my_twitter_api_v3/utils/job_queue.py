@@ -0,0 +1,168 @@
+"""
+Durable job queue for Twitter API v3
+Jobs are appended to a JSON Lines file so work queued by an interrupted run is picked up by the next one
+"""
+
+import asyncio
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List
+
+from .json_io import append_jsonl, iter_jsonl
+
+# Runs a job may start before it is marked failed; every start counts, so a job that
+# crashes the process mid-run is not retried forever
+MAX_ATTEMPTS = int(os.getenv("TW_QUEUE_MAX_ATTEMPTS", "3"))
+# Statuses that take a job out of the queue for good
+FINAL_STATUSES = ("done", "failed", "review")
+
+
+class PersistentQueue:
+    """Job queue whose state survives restarts, drained by asyncio workers"""
+
+    def __init__(self, path: str):
+        """
+        Initialize the queue
+
+        Args:
+            path: Path to the JSON Lines file holding the queue history
+        """
+        self.path = path
+
+    def put(self, job: Dict[str, Any]) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            job: JSON-serializable job payload
+
+        Returns:
+            str: Id of the queued job
+        """
+        job_id = uuid.uuid4().hex
+        append_jsonl(self.path, [{"id": job_id, "status": "pending", "job": job}])
+        return job_id
+
+    def mark_done(self, job_id: str) -> None:
+        """Record that a job finished so it is not run again"""
+        append_jsonl(self.path, [{"id": job_id, "status": "done"}])
+
+    def mark_attempt(self, job_id: str) -> None:
+        """Record that a run of a job is starting"""
+        append_jsonl(self.path, [{"id": job_id, "status": "attempt"}])
+
+    def mark_failed(self, job_id: str, reason: str, review: bool = False) -> None:
+        """
+        Take a job out of the queue without completing it
+
+        Args:
+            job_id: Id of the job
+            reason: Why the job stopped, kept for whoever looks at it
+            review: The job may have taken effect and needs a manual check rather than a retry
+        """
+        append_jsonl(self.path, [{"id": job_id, "status": "review" if review else "failed", "reason": reason}])
+
+    def _jobs(self) -> Dict[str, Dict[str, Any]]:
+        """Latest state of every job, in queue order"""
+        jobs: Dict[str, Dict[str, Any]] = {}
+        for entry in iter_jsonl(self.path):
+            status = entry.get("status")
+            if status == "pending":
+                jobs[entry["id"]] = {"id": entry["id"], "job": entry["job"], "status": status, "attempts": 0}
+                continue
+
+            job = jobs.get(entry.get("id"))
+            if job is None:
+                continue
+            if status == "attempt":
+                job["attempts"] += 1
+            else:
+                job["status"] = status
+                job["reason"] = entry.get("reason")
+        return jobs
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """
+        Jobs that were queued but never marked done, failed or for review, oldest first
+
+        Returns:
+            List of {"id": ..., "job": ..., "attempts": ...} entries
+        """
+        return [
+            {"id": job["id"], "job": job["job"], "attempts": job["attempts"]}
+            for job in self._jobs().values()
+            if job["status"] not in FINAL_STATUSES
+        ]
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """
+        Jobs marked failed or for review, oldest first
+
+        Returns:
+            List of {"id": ..., "job": ..., "status": ..., "reason": ...} entries
+        """
+        return [
+            {"id": job["id"], "job": job["job"], "status": job["status"], "reason": job.get("reason")}
+            for job in self._jobs().values()
+            if job["status"] in ("failed", "review")
+        ]
+
+    async def drain(self,
+                    handler: Callable[[Dict[str, Any]], Awaitable[bool]],
+                    workers: int = 1,
+                    max_attempts: int = MAX_ATTEMPTS) -> int:
+        """
+        Run every pending job through handler
+
+        A job whose handler raises stays pending for the next drain until it has been
+        started max_attempts times, then it is marked failed. A handler returning False
+        cannot say whether the job took effect, so the job is marked for review instead
+        of being retried.
+
+        Args:
+            handler: Coroutine function called with each job payload
+            workers: Number of jobs processed concurrently
+            max_attempts: Runs a job may start before it is marked failed
+
+        Returns:
+            int: Number of jobs completed
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in self.pending():
+            queue.put_nowait(entry)
+
+        completed = 0
+
+        async def worker():
+            nonlocal completed
+            while True:
+                try:
+                    entry = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if entry["attempts"] >= max_attempts:
+                    self.mark_failed(entry["id"], f"gave up after {entry['attempts']} attempts")
+                    print(f"Job {entry['id']} failed after {entry['attempts']} attempts")
+                    continue
+
+                # Recorded before the run, so a run that never reports back still counts
+                self.mark_attempt(entry["id"])
+                try:
+                    result = await handler(entry["job"])
+                except Exception as e:
+                    if entry["attempts"] + 1 >= max_attempts:
+                        self.mark_failed(entry["id"], str(e))
+                        print(f"Job {entry['id']} failed after {entry['attempts'] + 1} attempts: {e}")
+                    else:
+                        print(f"Job {entry['id']} failed, leaving it queued: {e}")
+                    continue
+
+                if result is False:
+                    self.mark_failed(entry["id"], "handler reported no result", review=True)
+                    print(f"Job {entry['id']} reported no result; marked for manual review")
+                else:
+                    self.mark_done(entry["id"])
+                    completed += 1
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+        return completed
@@ -0,0 +1,351 @@
+"""
+JSON helpers for Twitter API v3
+Uses orjson when it is installed and falls back to the standard library json module
+"""
+
+import functools
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterable, Iterator, Union
+
+try:
+    # ijson picks its fastest installed backend (yajl2_c when available)
+    import ijson
+except ImportError:  # ijson is optional; JSON arrays are then parsed in one piece
+    ijson = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; locking becomes a no-op there
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep catching this
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document
+
+    Args:
+        data: Raw JSON as bytes or str
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two space indentation
+
+    Returns:
+        The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: str) -> Any:
+    """
+    Load a JSON file
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The decoded Python object
+    """
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+@functools.lru_cache(maxsize=8)
+def _read_json_version(path: str, mtime_ns: int) -> Any:
+    """Parse path as of one modification time; mtime_ns only keys the cache"""
+    return read_json(path)
+
+
+def read_json_cached(path: str) -> Any:
+    """
+    Load a JSON file, reusing the parsed result until the file changes
+
+    A stat call keys the cache by modification time, so a hit skips both the read
+    and the parse. The result is shared between callers and must not be mutated;
+    use read_json for a private copy.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The decoded Python object
+    """
+    return _read_json_version(os.fspath(path), os.stat(path).st_mtime_ns)
+
+
+def write_json(path: str, obj: Any, indent: bool = True) -> None:
+    """
+    Write an object to a JSON file, replacing any existing content
+
+    The file is written to a temporary sibling and moved into place so a crash
+    mid-write never leaves a truncated file behind.
+
+    Args:
+        path: Path to the JSON file
+        obj: Object to serialize
+        indent: Pretty-print with two space indentation
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
+    os.replace(tmp_path, path)
+
+
+def write_json_array(path: str, items: Iterable[Any]) -> int:
+    """
+    Write items to a JSON file as one array, serializing a single item at a time
+
+    Unlike write_json, the encoded document is never built in memory; items go
+    through a 1 MiB write buffer, one per line. The file is replaced atomically
+    as in write_json.
+
+    Args:
+        path: Path to the JSON file
+        items: Items to write, in order; may be a generator
+
+    Returns:
+        int: Number of items written
+    """
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb", buffering=1 << 20) as f:
+        f.write(b"[")
+        for item in items:
+            f.write(b",\n" if count else b"\n")
+            f.write(dumps(item))
+            count += 1
+        f.write(b"\n]" if count else b"]")
+    os.replace(tmp_path, path)
+    return count
+
+
+@contextmanager
+def locked(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock for a read-modify-write of path
+
+    The lock is taken on a "<path>.lock" sibling, since the data file itself is
+    replaced on every write. Other processes using locked() on the same path wait.
+
+    Args:
+        path: Path of the file being updated
+    """
+    fd = os.open(f"{path}.lock", os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def _parse_jsonl_line(path: str, line: bytes) -> Any:
+    """Decode one JSON Lines record, returning None for blank or malformed lines"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return loads(line)
+    except JSONDecodeError:
+        print(f"Skipping malformed line in {path}")
+        return None
+
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON Lines file
+
+    Blank lines and lines that fail to parse, such as a write torn by a crash, are skipped.
+
+    Args:
+        path: Path to the JSON Lines file. A missing file yields no records.
+
+    Returns:
+        Iterator over the decoded records
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        for line in f:
+            record = _parse_jsonl_line(path, line)
+            if record is not None:
+                yield record
+
+
+def iter_jsonl_reverse(path: str, block_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON Lines file from the last line to the first
+
+    The file is read backwards in blocks, so stopping early only touches the tail.
+
+    Args:
+        path: Path to the JSON Lines file. A missing file yields no records.
+        block_size: Number of bytes read per step
+
+    Returns:
+        Iterator over the decoded records, newest first
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                record = _parse_jsonl_line(path, line)
+                if record is not None:
+                    yield record
+
+        record = _parse_jsonl_line(path, remainder)
+        if record is not None:
+            yield record
+
+
+def append_jsonl(path: str, records: Iterable[Any]) -> None:
+    """
+    Append records to a JSON Lines file without touching existing lines
+
+    All records go out in a single write on an O_APPEND descriptor, so concurrent
+    appenders from other threads or processes never interleave partial lines.
+
+    Args:
+        path: Path to the JSON Lines file, created if missing
+        records: Records to append, one per line
+    """
+    data = b"".join(dumps(record) + b"\n" for record in records)
+    if not data:
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        written = os.write(fd, data)
+        # Regular files are written in full; this only guards against a short write
+        while written < len(data):
+            written += os.write(fd, data[written:])
+    finally:
+        os.close(fd)
+
+
+def write_jsonl(path: str, records: Iterable[Any]) -> None:
+    """
+    Replace a JSON Lines file with the given records
+
+    The file is written to a temporary sibling and moved into place so readers
+    never observe a partially written file.
+
+    Args:
+        path: Path to the JSON Lines file
+        records: Records to write, one per line
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for record in records:
+            f.write(dumps(record) + b"\n")
+    os.replace(tmp_path, path)
+
+
+async def aiter_json_records(stream: Any, source: str = "stream",
+                             chunk_size: int = 1 << 16) -> AsyncIterator[Any]:
+    """
+    Stream records from an async byte stream holding a JSON array or JSON Lines
+
+    Arrays are parsed item by item with ijson when it is installed, so the whole
+    document is never held in memory. JSON Lines are decoded one line at a time and
+    malformed lines are skipped, as in iter_jsonl.
+
+    Args:
+        stream: Object with an awaitable read(n), such as aiohttp's response.content
+        source: Name used when reporting malformed lines
+        chunk_size: Number of bytes requested per read
+
+    Returns:
+        Async iterator over the decoded records
+    """
+    # Read until the first non-whitespace byte to see which layout this is
+    buffer = b""
+    while not buffer.strip():
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            return
+        buffer += chunk
+    buffer = buffer.lstrip()
+
+    if buffer[:1] == b"[":
+        if ijson is not None:
+            async for item in ijson.items_async(_AsyncPrefixReader(buffer, stream), "item", use_float=True):
+                yield item
+        else:
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    break
+                buffer += chunk
+            for item in loads(buffer):
+                yield item
+        return
+
+    while True:
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            record = _parse_jsonl_line(source, line)
+            if record is not None:
+                yield record
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+
+    record = _parse_jsonl_line(source, buffer)
+    if record is not None:
+        yield record
+
+
+class _AsyncPrefixReader:
+    """Async reader that replays bytes already taken from a stream before the rest of it"""
+
+    def __init__(self, prefix: bytes, stream: Any):
+        self._prefix = prefix
+        self._stream = stream
+
+    async def read(self, size: int = -1) -> bytes:
+        if self._prefix:
+            data, self._prefix = self._prefix, b""
+            return data
+        return await self._stream.read(size)
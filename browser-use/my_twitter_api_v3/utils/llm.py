@@ -0,0 +1,26 @@
+"""
+Shared LLM clients for Twitter API v3
+One ChatOpenAI per model is created on first use and reused by every agent
+"""
+
+from typing import Dict
+
+from langchain_openai import ChatOpenAI
+
+_chat_llms: Dict[str, ChatOpenAI] = {}
+
+
+def get_chat_llm(model: str = "gpt-4o") -> ChatOpenAI:
+    """
+    Get the shared ChatOpenAI instance for a model
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        ChatOpenAI instance reused across calls, keeping its HTTP connection pool warm
+    """
+    llm = _chat_llms.get(model)
+    if llm is None:
+        llm = _chat_llms[model] = ChatOpenAI(model=model)
+    return llm
@@ -0,0 +1,100 @@
+"""
+Near-duplicate text detection for Twitter API v3
+Uses 64-bit SimHash fingerprints with a banded index for Hamming distance lookups
+"""
+
+import hashlib
+import re
+from typing import Dict, List
+
+_URL_PATTERN = re.compile(r"https?://\S+")
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with links removed, since shortened URLs differ per post"""
+    return _TOKEN_PATTERN.findall(_URL_PATTERN.sub(" ", text.lower()))
+
+
+def simhash(tokens: List[str]) -> int:
+    """
+    Compute the 64-bit SimHash of a token list
+
+    Args:
+        tokens: Tokens of the text to fingerprint
+
+    Returns:
+        Fingerprint where similar texts differ in few bits
+    """
+    weights = [0] * HASH_BITS
+    for token in tokens:
+        token_hash = int.from_bytes(
+            hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if token_hash >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """Remembers fingerprints of seen texts and flags new texts that nearly match one"""
+
+    def __init__(self, max_distance: int = 3, min_tokens: int = 5):
+        """
+        Initialize an empty index
+
+        Args:
+            max_distance: Largest Hamming distance still treated as a duplicate.
+                Must be below BANDS so every near duplicate shares at least one band.
+            min_tokens: Texts with fewer tokens are never treated as duplicates
+        """
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be less than {BANDS}")
+
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+    def add(self, text: str) -> bool:
+        """
+        Add a text unless it is a near duplicate of one already in the index
+
+        Args:
+            text: Text to check and index
+
+        Returns:
+            bool: True if the text was new, False if it nearly matches an indexed text
+        """
+        tokens = tokenize(text)
+        if len(tokens) < self.min_tokens:
+            return True
+
+        fingerprint = simhash(tokens)
+        band_keys = self._band_keys(fingerprint)
+
+        for band, key in zip(self._bands, band_keys):
+            for candidate in band.get(key, ()):
+                if hamming_distance(fingerprint, candidate) <= self.max_distance:
+                    return False
+
+        for band, key in zip(self._bands, band_keys):
+            band.setdefault(key, []).append(fingerprint)
+        return True
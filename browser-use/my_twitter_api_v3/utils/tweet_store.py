@@ -0,0 +1,195 @@
+"""
+Append-only storage for saved tweets
+Tweets are kept one JSON object per line so saving a tweet never rewrites the archive
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from .json_io import append_jsonl, iter_jsonl, iter_jsonl_reverse, loads, locked, write_json_array, write_jsonl
+
+DATA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../data")
+)
+SAVED_TWEETS_FILE = os.path.join(DATA_DIR, "001_saved_tweets.jsonl")
+# compact_saved_tweets rewrites the file once superseded lines reach both thresholds
+COMPACT_MIN_DUPLICATES = 1000
+COMPACT_DUPLICATE_RATIO = 0.25
+
+
+def _migrate_legacy_file(path: str) -> None:
+    """
+    Convert the legacy 001_saved_tweets.json next to path into JSON Lines
+
+    Runs only while the JSON Lines file does not exist yet. Both legacy layouts are
+    understood: a bare array of records and a {"tweets": [...]} object. Migrated
+    records are stamped with the migration time as saved_at_ns.
+    """
+    if os.path.exists(path):
+        return
+
+    legacy_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(legacy_path):
+        return
+
+    with open(legacy_path, "rb") as f:
+        raw = f.read()
+
+    first_byte = raw.lstrip()[:1]
+    if first_byte == b"[":
+        records = loads(raw)
+    elif first_byte == b"{":
+        records = loads(raw).get("tweets", [])
+    else:
+        records = []
+
+    saved_at_ns = time.time_ns()
+    write_jsonl(
+        path,
+        (dict(record, saved_at_ns=saved_at_ns) for record in records if isinstance(record, dict)),
+    )
+    print(f"Migrated {legacy_path} to {path}")
+
+
+def iter_saved_tweets(path: str = SAVED_TWEETS_FILE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the raw saved tweet records in the order they were written
+
+    Args:
+        path: Path to the saved tweets JSON Lines file
+
+    Returns:
+        Iterator over tweet records
+    """
+    _migrate_legacy_file(path)
+    return iter_jsonl(path)
+
+
+def iter_recent_tweets(since_ns: int, path: str = SAVED_TWEETS_FILE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over records saved at or after a point in time, newest first
+
+    The file is read from the end and iteration stops at the first record saved
+    before since_ns, so older history is never read.
+
+    Args:
+        since_ns: Cutoff in epoch nanoseconds compared against each record's saved_at_ns
+        path: Path to the saved tweets JSON Lines file
+
+    Returns:
+        Iterator over recent tweet records
+    """
+    _migrate_legacy_file(path)
+    for record in iter_jsonl_reverse(path):
+        saved_at_ns = record.get("saved_at_ns")
+        if saved_at_ns is None or saved_at_ns < since_ns:
+            return
+        yield record
+
+
+def load_saved_tweets(path: str = SAVED_TWEETS_FILE) -> List[Dict[str, Any]]:
+    """
+    Load saved tweets with one entry per tweet_url
+
+    Later records for the same URL fill in or override the non-empty fields of
+    earlier ones, so re-saving a scraped tweet updates its placeholder entry.
+
+    Args:
+        path: Path to the saved tweets JSON Lines file
+
+    Returns:
+        List of tweets in order of first appearance
+    """
+    return _merge_records(iter_saved_tweets(path), lambda record: record.get("tweet_url"))
+
+
+def _record_key(record: Dict[str, Any]) -> Any:
+    """Identity of a saved record: Bright Data items carry an id, scraped tweets a tweet_url"""
+    return record.get("id") or record.get("tweet_url")
+
+
+def _merge_records(records: Iterable[Dict[str, Any]],
+                   key: Callable[[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+    """Collapse records sharing a key, letting later non-empty fields win; keyless records are dropped"""
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for record in records:
+        record_key = key(record)
+        if not record_key:
+            continue
+
+        existing = merged.get(record_key)
+        if existing is None:
+            merged[record_key] = dict(record)
+        else:
+            existing.update({k: v for k, v in record.items() if v not in (None, "")})
+
+    return list(merged.values())
+
+
+def export_saved_tweets(json_path: str, path: str = SAVED_TWEETS_FILE) -> int:
+    """
+    Materialize the saved tweets as a single JSON array, one entry per id or tweet_url
+
+    Args:
+        json_path: Destination JSON file
+        path: Path to the saved tweets JSON Lines file
+
+    Returns:
+        int: Number of exported records
+    """
+    return write_json_array(json_path, _merge_records(iter_saved_tweets(path), _record_key))
+
+
+def compact_saved_tweets(path: str = SAVED_TWEETS_FILE,
+                         min_duplicates: int = COMPACT_MIN_DUPLICATES,
+                         duplicate_ratio: float = COMPACT_DUPLICATE_RATIO) -> bool:
+    """
+    Rewrite the saved tweets file with one record per id or tweet_url once duplicates pile up
+
+    Nothing is written while fewer than min_duplicates lines, or less than
+    duplicate_ratio of the file, would be dropped. Merged records are written in
+    saved_at_ns order so iter_recent_tweets can keep stopping at the first old record.
+
+    Args:
+        path: Path to the saved tweets JSON Lines file
+        min_duplicates: Least number of redundant lines worth a rewrite
+        duplicate_ratio: Least fraction of redundant lines worth a rewrite
+
+    Returns:
+        bool: True if the file was rewritten
+    """
+    line_count = 0
+
+    def counted(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal line_count
+        for record in records:
+            line_count += 1
+            yield record
+
+    # save_tweets takes the same lock, so no append is lost between the read and the replace
+    with locked(path):
+        records = _merge_records(counted(iter_saved_tweets(path)), _record_key)
+        duplicates = line_count - len(records)
+        if duplicates < min_duplicates or duplicates < line_count * duplicate_ratio:
+            return False
+
+        records.sort(key=lambda record: record.get("saved_at_ns") or 0)
+        write_jsonl(path, records)
+
+    print(f"Compacted {path}: {line_count} lines into {len(records)} tweets")
+    return True
+
+
+def save_tweets(tweets: Iterable[Dict[str, Any]], path: str = SAVED_TWEETS_FILE) -> None:
+    """
+    Append tweets to the saved tweets file, stamping each with saved_at_ns
+
+    Args:
+        tweets: Tweet records to append
+        path: Path to the saved tweets JSON Lines file
+    """
+    _migrate_legacy_file(path)
+    saved_at_ns = time.time_ns()
+    with locked(path):
+        append_jsonl(path, (dict(tweet, saved_at_ns=saved_at_ns) for tweet in tweets))
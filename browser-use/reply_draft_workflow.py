@@ -1,22 +1,85 @@
 #!/usr/bin/env python
+import asyncio
+import hashlib
 import json
 import os
-import math
+import re
+import sys
+import time
+from pathlib import Path
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import random
 import datetime  # Add this import at the top with other imports
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv  # Add this import
 
-load_dotenv()
+from my_twitter_api_v3.utils.generated_tweets import save_generated_tweet
+from my_twitter_api_v3.utils.job_queue import PersistentQueue
+from my_twitter_api_v3.utils.json_io import JSONDecodeError, append_jsonl, dumps, iter_jsonl, loads
+from my_twitter_api_v3.utils.near_dup import hamming_distance, simhash, tokenize
+from my_twitter_api_v3.utils.tweet_store import load_saved_tweets
 
-SCRIPT_DIR = os.path.dirname(__file__)
+load_dotenv()
 
-pathToData = "../data"
-lastSavedTweets = "/001_saved_tweets.json"
-generatedTweets = "/002_generated_tweets.json"
-postedTweets = "/003_posted_tweets.json"
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Data files, resolved once relative to this script rather than the working directory
+DATA_DIR = SCRIPT_DIR.parent / "data"
+SAVED_TWEETS_FILE = DATA_DIR / "001_saved_tweets.jsonl"
+GENERATED_TWEETS_DB = DATA_DIR / "002_generated_tweets.db"
+POSTED_TWEETS_FILE = DATA_DIR / "003_posted_tweets.jsonl"
+# Replies waiting to be posted; entries left by an interrupted run are posted next time
+PENDING_REPLIES_FILE = DATA_DIR / "pending_replies.jsonl"
+# Browser sessions posting queued replies at the same time
+REPLY_WORKERS = max(1, int(os.getenv("TW_REPLY_WORKERS", "1")))
+# Pick the option closest to the target length instead of prompting, for unattended runs
+AUTO_SELECT = bool(os.getenv("TW_AUTO_SELECT"))
+
+# Trailing punctuation stripped from every generated option
+TRAILING_PUNCTUATION = re.compile(r"[.,!?;:]+$")
+EXCLAMATION_TO_PERIOD = str.maketrans("!", ".")
+SENTENCE_END = re.compile(r"[.?]")
+# Replies whose first sentence ends before this index drop that sentence
+MIN_FIRST_SENTENCE = 20
+
+# Raw LLM responses keyed by a hash of the rendered prompt
+CACHE_DIR = SCRIPT_DIR / ".cache" / "tweet_options"
+# SimHash fingerprints of cached original tweets, for reusing replies to near-identical tweets
+SIMILAR_INDEX_FILE = CACHE_DIR / "similar_index.jsonl"
+# Largest fingerprint distance still treated as the same tweet
+MAX_SIMILAR_DISTANCE = 3
+# Shorter tweets only match exactly; their fingerprints are too noisy
+MIN_SIMILAR_TOKENS = 5
+
+# Prompt pieces built once at import; only the tweet-specific fields are filled per call
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful assistant designed to output JSON."}
+REPLY_PROMPT = """
+            You're replying to this tweet: "{original_tweet}"
+            
+            Create one reply option about "{topic}" with a {tone} tone.
+            This is option {option_number} of {option_count}; take a different angle than the others would.
+            
+            Make the reply have a similar length to {target_length} characters.
+            The original tweet has an average word length of {avg_word_size:.1f} characters.
+            
+            Include only the full tweet text (match the target length of {target_length} characters)
+            
+            Make it compelling as a direct reply to the original tweet.
+            
+            Format your response as a JSON object with a key "tweet_options" containing an array with one object 
+            with a "tweet_text" field.
+            """
+# Options are generated by this many concurrent single-option requests
+REPLY_OPTION_COUNT = 10
+# Output token budget: about 3 characters per token plus room for the JSON wrapper
+CHARS_PER_TOKEN = 3
+JSON_WRAPPER_TOKENS = 24
+# Least completion budget for any reply; the JSON wrapper alone can take ~30 tokens,
+# and a truncated response is unparseable
+MIN_REPLY_TOKENS = 256
+# Option used when a response cannot be parsed at all
+FALLBACK_OPTION = {"tweet_text": "Reply option"}
 
 # Define the Tweet model
 class Tweet(BaseModel):
@@ -36,43 +99,210 @@ class TweetCreatorState(BaseModel):
 
     
     length_category: str = ""
+    target_length: str = ""
     tweet_batch: TweetOptions = None
     selected_tweet: Tweet = None
+    selected_at: int = 0
     
 # Simple LLM mock class for generating responses
 class LLM:
     def __init__(self, model, response_format=None):
         self.model = model
         self.response_format = response_format
+        # Created on first call and reused so connections stay pooled
+        self.client = None
         
-    def call(self, messages):
-        # Real implementation that calls OpenAI API
+    def _find_similar(self, context, fingerprint):
+        """Return the cache key of a response for a near-identical tweet with the same settings"""
+        for entry in iter_jsonl(SIMILAR_INDEX_FILE):
+            if entry["context"] == context and hamming_distance(entry["fingerprint"], fingerprint) <= MAX_SIMILAR_DISTANCE:
+                return entry["key"]
+        return None
+
+    async def acall(self, messages, use_cache=True, similar_to=None, max_tokens=None, fallback_count=10, fallback_start=1):
+        # Real implementation that calls OpenAI API without blocking the event loop
+        # similar_to is an optional (context, text) pair: a cached response for a
+        # text within MAX_SIMILAR_DISTANCE under the same context is reused.
+        # max_tokens caps the completion length; fallback_count sizes the mock response
+        # and fallback_start numbers its first option
+
+        # Identical prompts are answered from the on-disk cache
+        cache_key = hashlib.blake2b(dumps(messages), digest_size=16).hexdigest()
+        cache_path = os.path.join(CACHE_DIR, f"{cache_key}.json")
+        if use_cache:
+            # Opening directly saves a separate existence check on every call
+            try:
+                with open(cache_path, "r") as f:
+                    print("Using cached tweet options.")
+                    return f.read()
+            except FileNotFoundError:
+                pass
+
+        # Then near-identical texts generated with the same settings
+        fingerprint = None
+        if similar_to is not None:
+            context, text = similar_to
+            tokens = tokenize(text)
+            if len(tokens) >= MIN_SIMILAR_TOKENS:
+                fingerprint = simhash(tokens)
+                similar_key = self._find_similar(context, fingerprint) if use_cache else None
+                if similar_key:
+                    try:
+                        with open(os.path.join(CACHE_DIR, f"{similar_key}.json"), "r") as f:
+                            print("Using cached tweet options for a similar tweet.")
+                            return f.read()
+                    except FileNotFoundError:
+                        pass
         
         try:
-            # Get API key from environment variable
-            api_key = os.environ.get("OPENAI_API_KEY")
-                
-            client = OpenAI(api_key=api_key)
+            if self.client is None:
+                # Get API key from environment variable
+                api_key = os.environ.get("OPENAI_API_KEY")
+                self.client = AsyncOpenAI(api_key=api_key)
             
-            completion = client.chat.completions.create(
+            completion = await self.client.chat.completions.create(
                 model="gpt-4o-mini-2024-07-18",
                 messages=messages,  # Use the messages passed to the function
-                response_format={"type": "json_object"}  # Request JSON response format
+                response_format={"type": "json_object"},  # Request JSON response format
+                max_tokens=max_tokens,
             )
             print(completion.choices[0].message.content)
             # Extract the content from the response
-            return completion.choices[0].message.content
+            choice = completion.choices[0]
+            content = choice.message.content
+
+            # Only complete, well-formed responses are cached, never the fallback below;
+            # a cached truncated response would be served again on every rerun
+            if choice.finish_reason != "length" and _is_json(content):
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(cache_path, "w") as f:
+                    f.write(content)
+                if fingerprint is not None:
+                    append_jsonl(SIMILAR_INDEX_FILE, [{"context": similar_to[0], "fingerprint": fingerprint, "key": cache_key}])
+            return content
             
         except Exception as e:
             print(f"Error calling OpenAI API: {str(e)}")
             
             # Fallback to mock response if API call fails
             options = []
-            for i in range(10):
+            for i in range(fallback_start - 1, fallback_start - 1 + fallback_count):
                 options.append({
                     "tweet_text": f"hmm {i+1}."
                 })
-            return json.dumps({"tweet_options": options})
+            return dumps({"tweet_options": options}).decode("utf-8")
+
+def _is_json(content):
+    """Whether content is a parseable JSON document"""
+    try:
+        loads(content)
+    except (JSONDecodeError, TypeError):
+        return False
+    return True
+
+
+def _length_category(length):
+    """Bucket a character count into 20-character ranges (1-20, 21-40, 41-60, etc.)"""
+    category_start = (length // 20) * 20
+    return f"{category_start+1}-{category_start+20}"
+
+
+def _max_reply_tokens(length_category):
+    """Completion token budget for one reply in a "start-end" character range"""
+    max_chars = int(length_category.rsplit("-", 1)[1])
+    return max(MIN_REPLY_TOKENS, max_chars // CHARS_PER_TOKEN + JSON_WRAPPER_TOKENS)
+
+
+def _closest_to_length(options, length_category):
+    """Index of the option whose length is nearest the middle of a "start-end" range"""
+    start, end = length_category.rsplit("-", 1)
+    target_mid = (int(start) + int(end)) / 2
+    scores = [abs(len(option.tweet_text) - target_mid) for option in options]
+    return scores.index(min(scores))
+
+
+def _parse_tweet_options(response):
+    """Turn a raw LLM response into a list of Tweet options, tolerating loose JSON shapes"""
+    # Fast path: a well-formed response validates straight from the JSON text;
+    # an empty option list falls back so every response yields at least one option
+    try:
+        return TweetOptions.model_validate_json(response).tweet_options or [Tweet(**FALLBACK_OPTION)]
+    except ValidationError:
+        pass
+
+    # Parse the JSON response; a truncated or empty one falls back to a default option
+    try:
+        response_dict = loads(response)
+    except (JSONDecodeError, TypeError):
+        print("Could not parse the LLM response; using a default option.")
+        return [Tweet(**FALLBACK_OPTION)]
+    if not isinstance(response_dict, dict):
+        return [Tweet(**FALLBACK_OPTION)]
+
+    # Transform the response if needed to match our expected structure
+    if "tweet_options" not in response_dict and "replies" in response_dict:
+        # Convert "replies" to the expected "tweet_options" format
+        tweet_options = []
+        for reply in response_dict["replies"]:
+            tweet_options.append({"tweet_text": reply})
+        response_dict = {"tweet_options": tweet_options}
+
+    # Handle any other potential response format
+    if "tweet_options" not in response_dict:
+        # Create a fallback structure with whatever data we can find
+        tweet_options = []
+        # Look through the response for any arrays that might contain our tweets
+        for key, value in response_dict.items():
+            if isinstance(value, list) and len(value) > 0:
+                if isinstance(value[0], dict) and "tweet_text" in value[0]:
+                    # We found our tweet options
+                    tweet_options = value
+                    break
+                elif isinstance(value[0], str):
+                    # Convert strings to tweet objects
+                    tweet_options = [{"tweet_text": text} for text in value]
+                    break
+            elif isinstance(value, str) and key in ("tweet_text", "reply", "text"):
+                # A single option returned as a bare string
+                tweet_options = [{"tweet_text": value}]
+                break
+
+        # If we still don't have options, create an empty one as a last resort
+        if not tweet_options:
+            tweet_options = [FALLBACK_OPTION]
+
+        response_dict = {"tweet_options": tweet_options}
+
+    try:
+        return TweetOptions(**response_dict).tweet_options or [Tweet(**FALLBACK_OPTION)]
+    except ValidationError:
+        return [Tweet(**FALLBACK_OPTION)]
+
+
+def _compute_tweet_metrics(text):
+    """Return (length, average word size, length category) for a tweet"""
+    words = text.split()
+    avg_word_size = sum(map(len, words)) / len(words) if words else 0
+    return len(text), avg_word_size, _length_category(len(text))
+
+
+def format_timestamp(value):
+    """Render an epoch-nanosecond timestamp as ISO text; older ISO strings pass through"""
+    if isinstance(value, int):
+        return datetime.datetime.fromtimestamp(value / 1e9).isoformat()
+    return value
+
+
+_llm = None
+
+
+def get_llm():
+    """Get the shared LLM instance used for generating tweet options"""
+    global _llm
+    if _llm is None:
+        _llm = LLM(model="openai/gpt-4o-mini", response_format=TweetOptions)
+    return _llm
+
 
 class TweetCreatorFlow:
     def __init__(self):
@@ -83,115 +313,130 @@ class TweetCreatorFlow:
 
     def kickoff(self):
         """Start the workflow"""
-        # Try to get the last saved tweet first
-        if True:
-            self.get_last_saved_tweet()
-            tweet_batch = self.generate_tweet_options(self.state)
-        else:
-            # If no saved tweet, get user input
-            self.get_user_input()
-            tweet_batch = self.generate_tweet_options(self.state)
-        
-        self.select_tweet(tweet_batch)
-        return self.post_tweet()
+        return asyncio.run(self.akickoff())
+
+    async def akickoff(self):
+        """Run the workflow inside an existing event loop
+
+        The browser used to post the reply starts in the background before any
+        prompt, so its cold start overlaps with generation and the user's typing.
+        """
+        from my_twitter_api_v3.utils.agent_runner import get_agent_runner
+
+        warm_up = asyncio.create_task(self.start_browser())
+        try:
+            # Try to get the last saved tweet first
+            if True:
+                self.get_last_saved_tweet()
+                tweet_batch = await self.generate_tweet_options(self.state)
+            else:
+                # If no saved tweet, get user input
+                await self.get_user_input()
+                tweet_batch = await self.generate_tweet_options(self.state)
+            
+            await self.select_tweet(tweet_batch)
+            await warm_up
+            return await self.post_tweet()
+        finally:
+            if not warm_up.done():
+                warm_up.cancel()
+            await get_agent_runner().close()
+
+    async def start_browser(self):
+        """Launch the shared agent browser; a failure is left for the first task to report"""
+        from my_twitter_api_v3.utils.agent_runner import get_agent_runner
+
+        try:
+            await get_agent_runner().start()
+        except Exception as e:
+            print(f"Browser warm-up failed: {e}")
 
     def get_last_saved_tweet(self):
-        """Retrieve the last saved tweet from the saved_tweets.json file"""
+        """Retrieve the last saved tweet from the saved_tweets.jsonl file"""
         try:
-            with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "r") as f:
-                data = json.load(f)
-                if data and "tweets" in data and data["tweets"]:
-                    last_tweet = data["tweets"][0]
-                    print("Last saved tweet retrieved successfully.")
-                    print(f"Last Tweet: {last_tweet}")
-                    # Get original tweet to reply to
-                    self.state.original_tweet = last_tweet.get("text", "")
-                    self.state.tweet_url = last_tweet.get("tweet_url", "")
-
-                    # Calculate tweet metrics
-                    self.state.tweet_length = len(self.state.original_tweet)
-                    
-                    # Calculate average word size
-                    words = self.state.original_tweet.split()  # Fixed: need to split into words
-                    if words:
-                        self.state.avg_word_size = sum(len(word) for word in words) / len(words)
-                    else:
-                        self.state.avg_word_size = 0
-                        
-                    # Determine length category (0-20, 21-40, 41-60, etc.)
-                    category_start = math.floor(self.state.tweet_length / 20) * 20
-                    category_end = category_start + 20
-                    self.state.length_category = f"{category_start+1}-{category_end}"
-                    
-                    self.state.topic = "funny"
-
-                    # Get tone with validation
-                    self.state.tone = "humorous" #random.choice(["professional", "casual", "humorous"])
-                    print(f"Randomly selected tone: {self.state.tone}")
-
-                    print(f"\nOriginal tweet is {self.state.tweet_length} characters with avg word size of {self.state.avg_word_size:.1f}")
-                    print(f"Length category: {self.state.length_category} characters")
-                    print(f"Creating 10 reply options on {self.state.topic} with a {self.state.tone} tone...\n")
-                    return True
-                else:
-                    print("No tweets found in the saved_tweets.json file.")
-                    return False
+            tweets = load_saved_tweets(SAVED_TWEETS_FILE)
+            if tweets:
+                last_tweet = tweets[0]
+                print("Last saved tweet retrieved successfully.")
+                print(f"Last Tweet: {last_tweet}")
+                # Get original tweet to reply to
+                self.state.original_tweet = last_tweet.get("text", "")
+                self.state.tweet_url = last_tweet.get("tweet_url", "")
+
+                # Calculate tweet metrics
+                (self.state.tweet_length,
+                 self.state.avg_word_size,
+                 self.state.length_category) = _compute_tweet_metrics(self.state.original_tweet)
+                
+                self.state.topic = "funny"
+
+                # Get tone with validation
+                self.state.tone = "humorous" #random.choice(["professional", "casual", "humorous"])
+                print(f"Randomly selected tone: {self.state.tone}")
+
+                self.print_summary()
+                return True
+            else:
+                print("No tweets found in the saved_tweets.jsonl file.")
+                return False
         except FileNotFoundError:
-            print("The saved_tweets.json file does not exist.")
+            print("The saved_tweets.jsonl file does not exist.")
             return False
         except json.JSONDecodeError:
-            print("Error decoding the saved_tweets.json file.")
+            print("Error decoding the saved_tweets.jsonl file.")
             return False
 
-    def get_user_input(self):
-        """Get input from the user about the tweet topic, tone, and original tweet to reply to"""
+    async def get_user_input(self):
+        """Get input from the user about the tweet topic, tone, and original tweet to reply to
+
+        Prompts are read in a worker thread so other tasks on the event loop keep running.
+        """
         print("\n=== Create Your Engaging Tweet Reply ===\n")
 
         # Get original tweet to reply to
-        self.state.original_tweet = input("Enter the tweet you want to reply to: ")
+        self.state.original_tweet = await asyncio.to_thread(input, "Enter the tweet you want to reply to: ")
         
         # Calculate tweet metrics
-        self.state.tweet_length = len(self.state.original_tweet)
-        
-        # Calculate average word size
-        words = self.state.original_tweet.split()
-        if words:
-            self.state.avg_word_size = sum(len(word) for word in words) / len(words)
-        else:
-            self.state.avg_word_size = 0
-            
-        # Determine length category (0-20, 21-40, 41-60, etc.)
-        category_start = math.floor(self.state.tweet_length / 20) * 20
-        category_end = category_start + 20
-        self.state.length_category = f"{category_start+1}-{category_end}"
+        (self.state.tweet_length,
+         self.state.avg_word_size,
+         self.state.length_category) = _compute_tweet_metrics(self.state.original_tweet)
         
         # Get topic for the reply
-        self.state.topic = input("What topic would you like to focus on in your reply? ")
+        self.state.topic = await asyncio.to_thread(input, "What topic would you like to focus on in your reply? ")
 
         # Get tone with validation
-        while True:
-            tone_input = input("Select a tone: 1 for professional, 2 for casual, 3 for humorous: ")
-            if tone_input == "1":
-                self.state.tone = "professional"
-            elif tone_input == "2":
-                self.state.tone = "casual"
-            elif tone_input == "3":
-                self.state.tone = "humorous"
-            else:
-                print("Invalid selection. Please enter 1, 2, or 3.")
-                return  # Exit the function if the input is invalid
+        tone_input = await asyncio.to_thread(input, "Select a tone: 1 for professional, 2 for casual, 3 for humorous: ")
+        if tone_input == "1":
+            self.state.tone = "professional"
+        elif tone_input == "2":
+            self.state.tone = "casual"
+        elif tone_input == "3":
+            self.state.tone = "humorous"
+        else:
+            print("Invalid selection. Please enter 1, 2, or 3.")
+            return  # Exit the function if the input is invalid
 
-        print(f"\nOriginal tweet is {self.state.tweet_length} characters with avg word size of {self.state.avg_word_size:.1f}")
-        print(f"Length category: {self.state.length_category} characters")
-        print(f"Creating 10 reply options on {self.state.topic} with a {self.state.tone} tone...\n")
+        self.print_summary()
         return self.state
 
-    def generate_tweet_options(self, state):
-        """Generate multiple tweet reply options using an LLM"""
+    def print_summary(self):
+        """Show the metrics of the tweet being replied to in a single write"""
+        sys.stdout.write(
+            f"\nOriginal tweet is {self.state.tweet_length} characters with avg word size of {self.state.avg_word_size:.1f}\n"
+            f"Length category: {self.state.length_category} characters\n"
+            f"Creating {REPLY_OPTION_COUNT} reply options on {self.state.topic} with a {self.state.tone} tone...\n\n"
+        )
+        sys.stdout.flush()
+
+    async def generate_tweet_options(self, state, use_cache=True):
+        """Generate multiple tweet reply options using an LLM
+
+        Set use_cache to False to always ask the LLM for fresh options.
+        """
         print("Generating tweet reply options...")
         
-        # Initialize the LLM
-        llm = LLM(model="openai/gpt-4o-mini", response_format=TweetOptions)
+        # Reuse the shared LLM so repeated "new" requests keep the same client
+        llm = get_llm()
         
         # Adjust length for humorous tone
         target_length = state.length_category
@@ -199,112 +444,87 @@ class TweetCreatorFlow:
             # For humorous tone, aim for 1/3 of the original length
             humor_length = round(state.tweet_length / 3)
             # Recalculate the length category for humor
-            category_start = math.floor(humor_length / 20) * 20
-            category_end = category_start + 20
-            target_length = f"{category_start+1}-{category_end}"
+            target_length = _length_category(humor_length)
             print(f"Humor tone selected - adjusting length to approximately {target_length} characters")
-
-        # Create the messages for the tweet options
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
-            {"role": "user", "content": f"""
-            You're replying to this tweet: "{state.original_tweet}"
-            
-            Create 10 different reply options about "{state.topic}" with a {state.tone} tone.
-            
-            Make each reply have a similar length to {target_length} characters.
-            The original tweet has an average word length of {state.avg_word_size:.1f} characters.
-            
-            For each tweet option, include only the full tweet text (match the target length of {target_length} characters)
-            
-            Make each option distinct and compelling as a direct reply to the original tweet.
-            
-            Format your response as a JSON object with a key "tweet_options" containing an array of objects, 
-            each with a "tweet_text" field.
-            """}
-        ]
-
-        # Make the LLM call with JSON response format
-        response = llm.call(messages=messages)
-        
-        # Parse the JSON response
-        response_dict = json.loads(response)
-        
-        # Transform the response if needed to match our expected structure
-        if "tweet_options" not in response_dict and "replies" in response_dict:
-            # Convert "replies" to the expected "tweet_options" format
-            tweet_options = []
-            for reply in response_dict["replies"]:
-                tweet_options.append({"tweet_text": reply})
-            response_dict = {"tweet_options": tweet_options}
-        
-        # Handle any other potential response format
-        if "tweet_options" not in response_dict:
-            # Create a fallback structure with whatever data we can find
-            tweet_options = []
-            # Look through the response for any arrays that might contain our tweets
-            for key, value in response_dict.items():
-                if isinstance(value, list) and len(value) > 0:
-                    if isinstance(value[0], dict) and "tweet_text" in value[0]:
-                        # We found our tweet options
-                        tweet_options = value
-                        break
-                    elif isinstance(value[0], str):
-                        # Convert strings to tweet objects
-                        tweet_options = [{"tweet_text": text} for text in value]
-                        break
-            
-            # If we still don't have options, create empty ones as a last resort
-            if not tweet_options:
-                tweet_options = [{"tweet_text": f"Reply option {i+1}"} for i in range(10)]
-            
-            response_dict = {"tweet_options": tweet_options}
-        
-        self.state.tweet_batch = TweetOptions(**response_dict)
+        state.target_length = target_length
+
+        async def generate_option(option_number):
+            messages = [
+                SYSTEM_MESSAGE,
+                {"role": "user", "content": REPLY_PROMPT.format(
+                    original_tweet=state.original_tweet,
+                    topic=state.topic,
+                    tone=state.tone,
+                    target_length=target_length,
+                    avg_word_size=state.avg_word_size,
+                    option_number=option_number,
+                    option_count=REPLY_OPTION_COUNT,
+                )},
+            ]
+            # Make the LLM call with JSON response format
+            response = await llm.acall(
+                messages=messages,
+                use_cache=use_cache,
+                similar_to=(f"{state.topic}|{state.tone}|{target_length}|{option_number}", state.original_tweet),
+                max_tokens=max_tokens,
+                fallback_count=1,
+                fallback_start=option_number,
+            )
+            return _parse_tweet_options(response)
+
+        # One short request per option, all in flight at once, so the batch takes
+        # about as long as a single option instead of one long ten-option response
+        max_tokens = _max_reply_tokens(target_length)
+        responses = await asyncio.gather(
+            *(generate_option(number) for number in range(1, REPLY_OPTION_COUNT + 1))
+        )
+        self.state.tweet_batch = TweetOptions(
+            tweet_options=[option for options in responses for option in options[:1]]
+        )
         
         # Process all tweets for formatting requirements
         for option in self.state.tweet_batch.tweet_options:
-            # Remove trailing punctuation
-            option.tweet_text = option.tweet_text.rstrip('.,!?;:')
+            # Remove trailing punctuation and replace all exclamation points with periods
+            text = TRAILING_PUNCTUATION.sub("", option.tweet_text).translate(EXCLAMATION_TO_PERIOD)
             
-            # Replace all exclamation points with periods
-            option.tweet_text = option.tweet_text.replace('!', '.')
-            
-            # Validate first sentence length using multiple sentence endings
-            first_sentence_end = min(
-                (pos for pos in [
-                    option.tweet_text.find('.'), 
-                    option.tweet_text.find('?')
-                ] if pos != -1),
-                default=-1
-            )
-            # Check if the first sentence is less than 20 characters
-            if first_sentence_end != -1 and first_sentence_end < 20:
-                second_sentence_start = option.tweet_text.find(' ', first_sentence_end + 1)
+            # Find a sentence ending within the first 20 characters in one bounded scan
+            first_sentence_end = SENTENCE_END.search(text, 0, MIN_FIRST_SENTENCE)
+            # Drop a first sentence shorter than 20 characters
+            if first_sentence_end:
+                second_sentence_start = text.find(' ', first_sentence_end.start() + 1)
                 if second_sentence_start != -1:
-                    option.tweet_text = option.tweet_text[second_sentence_start + 1:]
+                    text = text[second_sentence_start + 1:]
+            
+            option.tweet_text = text
 
         print(f"Generated {len(self.state.tweet_batch.tweet_options)} tweet reply options")
         return self.state.tweet_batch
 
-    def select_tweet(self, tweet_batch):
+    async def select_tweet(self, tweet_batch):
         """Let the user select a tweet or generate new options"""
         print("\n=== Tweet Reply Options ===\n")
         print(f"Original Tweet: {self.state.original_tweet}\n")
 
         while True:
-            # Display all tweet options
+            # Display all tweet options, rendered into one buffer and written once
+            parts = []
             for i, option in enumerate(tweet_batch.tweet_options, 1):
-                print(f"\nOption {i} ({len(option.tweet_text)} chars):")
-                print(f"Reply: {option.tweet_text}")
-                print("-" * 50)
-
-            # Get user selection
-            selection = input("\nSelect a reply (1-10), or type 'new' for new options, or 'exit' to quit: ")
+                parts.append(f"\nOption {i} ({len(option.tweet_text)} chars):\n")
+                parts.append(f"Reply: {option.tweet_text}\n")
+                parts.append("-" * 50 + "\n")
+            sys.stdout.write("".join(parts))
+            sys.stdout.flush()
+
+            # Get user selection, or pick one unattended
+            if AUTO_SELECT:
+                selection = str(_closest_to_length(tweet_batch.tweet_options, self.state.target_length) + 1)
+                print(f"\nAuto-selected option {selection}")
+            else:
+                selection = await asyncio.to_thread(input, f"\nSelect a reply (1-{len(tweet_batch.tweet_options)}), or type 'new' for new options, or 'exit' to quit: ")
             
             if selection.lower() == 'new':
-                # Generate new options
-                return self.generate_tweet_options(self.state)
+                # Generate new options, bypassing the cache so they actually differ
+                return await self.generate_tweet_options(self.state, use_cache=False)
             
             elif selection.lower() == 'exit':
                 print("Exiting without selecting a tweet reply.")
@@ -315,77 +535,58 @@ class TweetCreatorFlow:
                 selected_index = int(selection) - 1
                 self.state.selected_tweet = tweet_batch.tweet_options[selected_index]
                 
-                # Get the current date and time in ISO format
-                current_date = datetime.datetime.now().isoformat()
+                # Creation time as integer epoch nanoseconds, reused when the reply is posted
+                current_date = time.time_ns()
+                self.state.selected_at = current_date
                 
-                # Prepare data to save
-                tweet_dict = {
-                    
-                    "tweet_text": self.state.original_tweet,
+                # One inserted row per reply; earlier replies are never rewritten
+                save_generated_tweet(
+                    tweet_text=self.state.original_tweet,
+                    tweet_url=self.state.tweet_url,
+                    reply_text=self.state.selected_tweet.tweet_text,
+                    date_created=current_date,
+                    path=str(GENERATED_TWEETS_DB),
+                )
+                print(f"\nTweet reply selected and saved to: {GENERATED_TWEETS_DB}")
+
+                # Queue the reply for posting
+                PersistentQueue(PENDING_REPLIES_FILE).put({
                     "tweet_url": self.state.tweet_url,
-                    "reply": {
-                        "tweet_text": self.state.selected_tweet.tweet_text,
-                        "date_created": current_date
-                    }
-                }
-
-                # Load existing data if file exists
-                existing_data = []
-                if os.path.exists(pathToData+generatedTweets) and os.path.getsize(pathToData+generatedTweets) > 0:
-                    try:
-                        with open(pathToData+generatedTweets, "r") as f:
-                            existing_data = json.load(f)
-                            # Convert to list if it's a single object
-                            if not isinstance(existing_data, list):
-                                existing_data = [existing_data]
-                    except json.JSONDecodeError:
-                        print("Error reading existing file. Starting with empty list.")
-
-                # Append new data
-                existing_data.append(tweet_dict)
-
-                # Make sure directory exists
-                directory = os.path.dirname(pathToData+generatedTweets)
-                if directory and not os.path.exists(directory):
-                    os.makedirs(directory)
-
-                # Save updated data
-                with open(pathToData+generatedTweets, "w") as f:
-                    json.dump(existing_data, f, indent=2)
-                    print(f"\nTweet reply selected and saved to: {pathToData+generatedTweets}")
+                    "tweet_text": self.state.original_tweet,
+                    "reply_text": self.state.selected_tweet.tweet_text,
+                    "reply_time": current_date,
+                })
             
             else:
                 print("Invalid selection. Please try again.")
             return
 
-    def post_tweet(self):
-        try:
-            with open(os.path.join(SCRIPT_DIR, pathToData + generatedTweets), "r") as f:
-                data = json.load(f)
-                if data:
-                    last_reply = data[-1]
-                    print("Last saved reply retrieved successfully.")
-                    print(f"Last Reply: {last_reply}")
-                    # Prepare data to save
-                    posted_tweet_dict = {
-                        "tweet_url": last_reply["tweet_url"],
-                        "tweet_text": last_reply["tweet_text"],
-                        "reply_text": last_reply["reply"]["tweet_text"],
-                        "reply_time": last_reply["reply"]["date_created"]
-                    }
-
-                    from my_twitter_api_v3.manage_posts.reply_to_post import reply_to_post
-                    import asyncio
-                    asyncio.run(reply_to_post(tweet_url=last_reply["tweet_url"], my_post=last_reply["reply"]["tweet_text"]))
-                    return True
+    async def post_tweet(self):
+        """Post every queued reply, including any left over from an interrupted run"""
+        from my_twitter_api_v3.manage_posts.reply_to_post import reply_to_post
+        from my_twitter_api_v3.utils.agent_runner import get_agent_runner
 
+        async def post_reply(job):
+            reply_time = format_timestamp(job["reply_time"])
+            print(f"Posting reply queued at {reply_time}: {job['reply_text']}")
+            return await reply_to_post(tweet_url=job["tweet_url"], my_post=job["reply_text"],
+                                       reply_time=reply_time)
 
-        except FileNotFoundError:
-            print("The generated_tweets.json file does not exist.")
-            return False
-        except json.JSONDecodeError:
-            print("Error decoding the generated_tweets.json file.")
-            return False
+        queue = PersistentQueue(PENDING_REPLIES_FILE)
+        already_failed = {entry["id"] for entry in queue.failed()}
+        try:
+            # Workers share one browser, each reply in its own context
+            posted = await queue.drain(post_reply, workers=REPLY_WORKERS)
+        finally:
+            await get_agent_runner().close()
+        print(f"Posted {posted} queued replies.")
+        # A reply whose run ended without a result may still have been posted; these are
+        # not retried automatically, so list them for a manual check
+        for entry in queue.failed():
+            if entry["id"] in already_failed:
+                continue
+            print(f"Needs manual check ({entry['status']}: {entry['reason']}): {entry['job']['tweet_url']}")
+        return posted > 0
 
 
 if __name__ == "__main__":
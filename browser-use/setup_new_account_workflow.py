@@ -76,34 +76,47 @@ class TweetCreatorFlow:
 
     def kickoff(self):
         """Start the workflow"""
+        return asyncio.run(self.akickoff())
+
+    async def akickoff(self):
+        """Run the workflow inside a single event loop"""
+        from my_twitter_api_v3.follows.follow_system import close_follower
+        from my_twitter_api_v3.utils.agent_runner import get_agent_runner
+
         self.get_about()
-        self.follow_accounts()
-        self.block_accounts()
-        # self.create_list()
-        self.add_members_to_list(list_name="asdfasdf")
+        try:
+            # Steps stay sequential: they act on the same account and rewrite the same users file
+            await self.follow_accounts()
+            await self.block_accounts()
+            # await self.create_list()
+            await self.add_members_to_list(list_name="asdfasdf")
+        finally:
+            # The steps share these browsers; close them before the event loop ends
+            await close_follower()
+            await get_agent_runner().close()
         return True
 
-    def follow_accounts(self):
+    async def follow_accounts(self):
         try:
             with open(os.path.join(SCRIPT_DIR, pathToData + users), "r") as f:
                 data = json.load(f)
                 if data:
-                    filtered_data = {
-                        user["handle"]: user["score"]
+                    pending_users = [
+                        user
                         for user in data
                         if user["score"] != 100
                         and not user.get("alreadyFollowingOrBlocked", False)
-                    }
-                    print(filtered_data)
+                    ]
+                    print({user["handle"]: user["score"] for user in pending_users})
 
                     from my_twitter_api_v3.follows.follow_system import follow_user
 
-                    for user_handle in filtered_data.keys():
-                        asyncio.run(follow_user(handle=user_handle))
-                        # Update the 'alreadyFollowingOrBlocked' field
-                        for user in data:
-                            if user["handle"] in filtered_data:
-                                user["alreadyFollowingOrBlocked"] = True
+                    for user in pending_users:
+                        # Only the user just followed is marked, so an interrupted
+                        # or rate-limited run leaves the rest pending
+                        if not await follow_user(handle=user["handle"]):
+                            continue
+                        user["alreadyFollowingOrBlocked"] = True
 
                         # Save the updated data
                         with open(
@@ -120,28 +133,24 @@ class TweetCreatorFlow:
             print("Error decoding the 004_users.json file.")
             return False
 
-    def block_accounts(self):
+    async def block_accounts(self):
         try:
             with open(os.path.join(SCRIPT_DIR, pathToData + users), "r") as f:
                 data = json.load(f)
                 if data:
-                    filtered_data = {
-                        user["handle"]: user["score"]
+                    pending_users = [
+                        user
                         for user in data
                         if user["score"] == 100
                         and not user.get("alreadyFollowingOrBlocked", False)
-                    }
-                    print(filtered_data)
+                    ]
+                    print({user["handle"]: user["score"] for user in pending_users})
 
                     from my_twitter_api_v3.blocks.block_user import block_user
 
-                    for user_handle in filtered_data.keys():
-                        asyncio.run(block_user(handle=user_handle))
-
-                        # Update the 'alreadyFollowingOrBlocked' field
-                        for user in data:
-                            if user["handle"] in filtered_data:
-                                user["alreadyFollowingOrBlocked"] = True
+                    for user in pending_users:
+                        await block_user(handle=user["handle"])
+                        user["alreadyFollowingOrBlocked"] = True
 
                         # Save the updated data
                         with open(
@@ -157,7 +166,7 @@ class TweetCreatorFlow:
             print("Error decoding the 004_users.json file.")
             return False
 
-    def create_list(self):
+    async def create_list(self):
         def generate_random_name(length=8):
             letters = string.ascii_lowercase
             return "".join(random.choice(letters) for i in range(length))
@@ -165,13 +174,13 @@ class TweetCreatorFlow:
         name = generate_random_name()
         from my_twitter_api_v3.lists.create_list import create_list
 
-        asyncio.run(create_list(name=name))
+        await create_list(name=name)
 
         self.save_json_to_file(str(pathToData + lists), {"name": name, "handles": []})
 
         return True
 
-    def add_members_to_list(self, list_name="asdfasdf"):
+    async def add_members_to_list(self, list_name="asdfasdf"):
         try:
             with open(os.path.join(SCRIPT_DIR, pathToData + users), "r") as f:
                 data = json.load(f)
@@ -194,12 +203,10 @@ class TweetCreatorFlow:
                         add_members_to_list,
                     )
 
-                    asyncio.run(
-                        add_members_to_list(
-                            name=list_name,
-                            handle=self.handle,
-                            membersToAdd=filtered_data,
-                        )
+                    await add_members_to_list(
+                        name=list_name,
+                        handle=self.handle,
+                        membersToAdd=filtered_data,
                     )  # Add user to the list
 
                     # Update the 'alreadyFollowingOrBlocked' field
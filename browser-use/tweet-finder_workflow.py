@@ -1,21 +1,34 @@
 #!/usr/bin/env python
+import argparse
 import json
 import os
 import math
 from typing import List
 from pydantic import BaseModel, Field
 import random
+import time
 import datetime  # Add this import at the top with other imports
 from openai import OpenAI
 from dotenv import load_dotenv  # Add this import
 import asyncio
+
+from my_twitter_api_v3.utils.tweet_store import (
+    iter_recent_tweets,
+    iter_saved_tweets,
+    load_saved_tweets,
+    save_tweets,
+)
+
 load_dotenv()
 
 SCRIPT_DIR = os.path.dirname(__file__)
 
 pathToData = "../data"
 aboutMe = "/000_about_me.json"
-lastSavedTweets = "/001_saved_tweets.json"
+lastSavedTweets = "/001_saved_tweets.jsonl"
+
+# Duplicates from the list timeline show up within this window (4 weeks, in ns) of being saved
+DEDUP_WINDOW_NS = 4 * 7 * 86400 * 10**9
 
     
 # Simple LLM mock class for generating responses
@@ -54,6 +67,13 @@ class LLM:
             return json.dumps({"tweet_options": options})
 
 class TweetCreatorFlow:
+    def __init__(self, full_dedup=False):
+        """
+        Args:
+            full_dedup: Check new tweets against the whole archive instead of
+                only the tweets saved within DEDUP_WINDOW_NS
+        """
+        self.full_dedup = full_dedup
 
     def get_about(self):
         with open(os.path.join(SCRIPT_DIR, pathToData + aboutMe), "r") as f:
@@ -69,58 +89,62 @@ class TweetCreatorFlow:
         return True
 
     def monitor_list_updates(self):
-        from my_twitter_api_v3.lists.get_list_posts_timeline import get_list_posts
-        new_tweets = get_list_posts()
+        from my_twitter_api_v3.lists.get_list_posts_timeline import close_browser, get_list_posts
+        try:
+            new_tweets = get_list_posts()
+        finally:
+            # Stop the sync Playwright driver before get_tweet_here starts an event loop
+            close_browser()
         print(new_tweets)
         
-        # Read existing data first
-        try:
-            with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "r") as f:
-                existing_data = json.load(f)
-                # Ensure proper structure
-                if "tweets" not in existing_data or not isinstance(existing_data["tweets"], list):
-                    existing_data = {"tweets": []}
-                # Remove string entries if any exist
-                existing_data["tweets"] = [t for t in existing_data["tweets"] if isinstance(t, dict)]
-        except (FileNotFoundError, json.JSONDecodeError):
-            # If file doesn't exist or is empty/invalid, start with empty structure
-            existing_data = {"tweets": []}
-        print("\n\n" + str(existing_data))
-        # Get existing tweet URLs to avoid duplicates
-        existing_urls = {tweet.get("tweet_url", "") for tweet in existing_data["tweets"] 
-                         if isinstance(tweet, dict) and "tweet_url" in tweet}
-
-        # Compare new_tweets with existing_data and remove duplicates
+        # Collect the URLs already saved to avoid duplicates
+        if self.full_dedup:
+            saved_tweets = iter_saved_tweets()
+        else:
+            saved_tweets = iter_recent_tweets(time.time_ns() - DEDUP_WINDOW_NS)
+        existing_urls = {tweet.get("tweet_url") for tweet in saved_tweets
+                         if isinstance(tweet, dict) and tweet.get("tweet_url")}
+
+        # Keep only tweets that are not saved yet
+        to_save = []
         for tweet in new_tweets:
             if isinstance(tweet, dict) and "tweet_url" in tweet:
                 if tweet["tweet_url"] not in existing_urls:
-                    existing_data["tweets"].append(tweet)
+                    to_save.append(tweet)
                     existing_urls.add(tweet["tweet_url"])
                 # If it's a duplicate, do nothing (remove it)
-        
-        print("\n\n" + str(existing_data))
-        # Write the updated data back to the file
-        with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "w") as f:
-            json.dump(existing_data, f, indent=2)
+
+        print(f"\n\nSaving {len(to_save)} new tweets")
+        # Append the new tweets without rewriting the file
+        save_tweets(to_save)
         return True
     
     def get_tweet_here(self):
 
-        # Load existing tweets from the JSON file
-        with open(os.path.join(SCRIPT_DIR, pathToData + lastSavedTweets), "r") as f:
-            existing_data = json.load(f)
-            tweets = existing_data.get("tweets", [])
-            
-            # Iterate through each tweet
-            for tweet in tweets:
-                # Check if the tweet has a non-empty tweet_url and other fields are empty
-                if tweet.get("tweet_url") and all(not tweet.get(key) for key in ["handle", "datetime", "text", "likes", "retweets", "replies", "bookmarks", "viewcount"]):
-                    # Send the tweet_url to get_tweet
-                    from my_twitter_api_v3.get_tweet.get_tweet import get_tweet
-                    asyncio.run(get_tweet(tweet["tweet_url"]))
+        # Load saved tweets, merged per tweet_url
+        tweets = load_saved_tweets()
+
+        # Collect tweets that have a non-empty tweet_url but no other fields yet
+        pending_urls = [
+            tweet["tweet_url"] for tweet in tweets
+            if tweet.get("tweet_url") and all(not tweet.get(key) for key in ["handle", "datetime", "text", "likes", "retweets", "replies", "bookmarks", "viewcount"])
+        ]
+
+        if pending_urls:
+            # Fetch them concurrently in one event loop sharing a single browser
+            from my_twitter_api_v3.get_tweet.get_tweet import get_tweets
+            asyncio.run(get_tweets(pending_urls))
         return True
     
 
 if __name__ == "__main__":
-    workflow = TweetCreatorFlow()
+    parser = argparse.ArgumentParser(description="Find new tweets from the monitored list")
+    parser.add_argument(
+        "--full-dedup",
+        action="store_true",
+        help="Deduplicate against the whole saved tweets archive (use for the first backfill)",
+    )
+    args = parser.parse_args()
+
+    workflow = TweetCreatorFlow(full_dedup=args.full_dedup)
     workflow.kickoff()
\ No newline at end of file
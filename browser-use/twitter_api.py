@@ -21,6 +21,10 @@ from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
+from my_twitter_api_v3.follows.follow_system import close_follower, get_follower
+from my_twitter_api_v3.utils.json_io import read_json
+from my_twitter_api_v3.utils.tweet_store import save_tweets
+
 load_dotenv()
 
 # Type variable for generic return types
@@ -63,6 +67,7 @@ class TwitterAPIConfig:
         self.cookie_file_path = self._resolve_cookie_path()
         self.llm_model = self.config.get("llm", {}).get("model", "gpt-4o")
         self.llm_temperature = self.config.get("llm", {}).get("temperature", 0.7)
+        self._llm = None
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
@@ -93,8 +98,7 @@ class TwitterAPIConfig:
                 }
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return read_json(config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading config from {config_path}: {e}")
             # Default configuration if error loading config file
@@ -146,11 +150,13 @@ class TwitterAPIConfig:
         )
     
     def get_llm(self) -> ChatOpenAI:
-        """Get a ChatOpenAI instance with configured settings"""
-        return ChatOpenAI(
-            model=self.llm_model,
-            temperature=self.llm_temperature
-        )
+        """Get the ChatOpenAI instance with configured settings, created once and shared"""
+        if self._llm is None:
+            self._llm = ChatOpenAI(
+                model=self.llm_model,
+                temperature=self.llm_temperature
+            )
+        return self._llm
 
 
 # Global configuration instance
@@ -334,16 +340,7 @@ async def get_tweet(post_url: str) -> Optional[Tweet]:
                 
                 # Save tweet data
                 try:
-                    # Load existing tweets from JSON file if it exists
-                    tweets_file = config.get_data_file_path("001_saved_tweets.json")
-                    existing_tweets = []
-                    
-                    try:
-                        with open(tweets_file, "r") as f:
-                            data = json.load(f)
-                            existing_tweets = data.get("tweets", [])
-                    except (FileNotFoundError, json.JSONDecodeError):
-                        existing_tweets = []
+                    tweets_file = config.get_data_file_path("001_saved_tweets.jsonl")
                     
                     # Create a dictionary representation of the tweet
                     tweet_dict = {
@@ -358,23 +355,9 @@ async def get_tweet(post_url: str) -> Optional[Tweet]:
                         "viewcount": parsed_tweet.viewcount,
                     }
                     
-                    # Check if the tweet's URL matches the post_url and update or add it
-                    updated = False
-                    for i, existing in enumerate(existing_tweets):
-                        if existing["tweet_url"] == tweet_dict["tweet_url"]:
-                            existing_tweets[i] = tweet_dict
-                            updated = True
-                            print(f"Updated tweet from {tweet_dict['handle']} at {post_url}")
-                            break
-                    
-                    if not updated:
-                        existing_tweets.append(tweet_dict)
-                        print(f"Added new tweet from {tweet_dict['handle']} at {post_url}")
-                    
-                    # Save updated tweets list
-                    with open(tweets_file, "w") as f:
-                        json.dump({"tweets": existing_tweets}, f, indent=2)
-                        print("Updated tweets saved.")
+                    # Append only; readers collapse records for the same tweet_url
+                    save_tweets([tweet_dict], tweets_file)
+                    print(f"Saved tweet from {tweet_dict['handle']} at {post_url}")
                 
                 except Exception as e:
                     print(f"Error saving tweet data: {e}")
@@ -541,6 +524,8 @@ async def follow_user(username: str) -> bool:
     """
     Follow a user on Twitter
     
+    Follows share one browser; await close_follower() once the last follow is done.
+    
     Args:
         username: Username of the user to follow
         
@@ -548,64 +533,53 @@ async def follow_user(username: str) -> bool:
         True if successful, False otherwise
     """
     config = get_twitter_config()
-    initial_actions = [
-        {"open_tab": {"url": f"https://x.com/{username}"}},
-    ]
     
-    async with TwitterBrowserSession(config) as session:
-        agent = session.create_agent(
-            task=PromptTemplates.follow_user_prompt(username),
-            initial_actions=initial_actions
-        )
-        
-        history = await agent.run(max_steps=6)
-        result = history.final_result()
-        
-        if result:
-            # Save follow data
+    # Follow through the shared, rate-limited follower instead of a fresh browser
+    if await get_follower().follow_user(username):
+        # Save follow data
+        try:
+            follow_time = datetime.now().isoformat()
+            follow_data = {
+                "username": username,
+                "follow_time": follow_time
+            }
+            
+            follows_file = config.get_data_file_path("004_users.json")
+            
+            # Load existing follows if file exists
+            existing_data = {}
             try:
-                follow_time = datetime.now().isoformat()
-                follow_data = {
-                    "username": username,
-                    "follow_time": follow_time
-                }
-                
-                follows_file = config.get_data_file_path("004_users.json")
-                
-                # Load existing follows if file exists
+                with open(follows_file, "r") as f:
+                    existing_data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
                 existing_data = {}
-                try:
-                    with open(follows_file, "r") as f:
-                        existing_data = json.load(f)
-                except (FileNotFoundError, json.JSONDecodeError):
-                    existing_data = {}
-                
-                # Initialize follows list if it doesn't exist
-                if "follows" not in existing_data:
-                    existing_data["follows"] = []
-                
-                # Check if user is already in follows list
-                for i, existing in enumerate(existing_data["follows"]):
-                    if existing["username"] == username:
-                        existing_data["follows"][i] = follow_data
-                        print(f"Updated follow data for @{username}")
-                        break
-                else:
-                    # Add new follow
-                    existing_data["follows"].append(follow_data)
-                    print(f"Added follow data for @{username}")
-                
-                # Save updated follows list
-                with open(follows_file, "w") as f:
-                    json.dump(existing_data, f, indent=2)
-                    print(f"Follow data saved to {follows_file}")
             
-            except Exception as e:
-                print(f"Error saving follow data: {e}")
+            # Initialize follows list if it doesn't exist
+            if "follows" not in existing_data:
+                existing_data["follows"] = []
             
-            return True
+            # Check if user is already in follows list
+            for i, existing in enumerate(existing_data["follows"]):
+                if existing["username"] == username:
+                    existing_data["follows"][i] = follow_data
+                    print(f"Updated follow data for @{username}")
+                    break
+            else:
+                # Add new follow
+                existing_data["follows"].append(follow_data)
+                print(f"Added follow data for @{username}")
+            
+            # Save updated follows list
+            with open(follows_file, "w") as f:
+                json.dump(existing_data, f, indent=2)
+                print(f"Follow data saved to {follows_file}")
         
-        return False
+        except Exception as e:
+            print(f"Error saving follow data: {e}")
+        
+        return True
+    
+    return False
 
 
 async def block_user(username: str) -> bool:
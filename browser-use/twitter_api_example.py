@@ -14,6 +14,7 @@ from browser_use.twitter_api import (
     create_post,
     reply_to_post,
     follow_user,
+    close_follower,
     block_user,
     create_list,
     add_members_to_list,
@@ -76,7 +77,10 @@ async def follow_user_example(username: str):
     """Example of following a user"""
     print(f"Following user @{username}...")
     
-    success = await follow_user(username)
+    try:
+        success = await follow_user(username)
+    finally:
+        await close_follower()
     
     if success:
         print(f"Successfully followed @{username}!")
@@ -25,9 +25,10 @@ from typing import Dict, List, Optional, Tuple, Any
 from browser_use import Agent, Browser, Controller
 from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 from my_twitter_api_v3.utils.cookie_manager import get_cookie_manager
+from my_twitter_api_v3.utils.json_io import read_json
+from my_twitter_api_v3.utils.llm import get_chat_llm
 
 load_dotenv()
 
@@ -84,8 +85,7 @@ class XFollowerAutomation:
             config_path = os.path.join(current_dir, "../../config.json")
         
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            return read_json(config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading config from {config_path}: {e}")
             return {}
@@ -127,7 +127,7 @@ class XFollowerAutomation:
             controller = Controller()
             agent = Agent(
                 task=f"Navigate to {self.target_username}'s followers page",
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 initial_actions=initial_actions,
@@ -150,7 +150,7 @@ class XFollowerAutomation:
             # Create agent to click on followers link
             followers_agent = Agent(
                 task=f"Click on {self.target_username}'s followers link",
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 initial_actions=follow_actions,
@@ -200,7 +200,7 @@ class XFollowerAutomation:
             # Create agent to find and click follow buttons
             follow_agent = Agent(
                 task=follow_task,
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 max_actions_per_step=4,
@@ -247,7 +247,7 @@ class XFollowerAutomation:
             
             scroll_agent = Agent(
                 task="Scroll down to load more followers",
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 initial_actions=scroll_action,
@@ -297,7 +297,7 @@ class XFollowerAutomation:
             controller = Controller()
             refresh_agent = Agent(
                 task="Refresh the page",
-                llm=ChatOpenAI(model="gpt-4o"),
+                llm=get_chat_llm("gpt-4o"),
                 save_conversation_path="logs/conversation",
                 browser_context=context,
                 initial_actions=refresh_action,